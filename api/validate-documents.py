@@ -2,7 +2,6 @@ from http.server import BaseHTTPRequestHandler
 import json
 import os
 import base64
-import tempfile
 import logging
 import sys
 import time
@@ -1179,47 +1178,38 @@ def calculate_field_statistics(response_dict):
 
 def process_pdf_content(file_content: bytes, doc_type: str, user_id: str = None, supabase: Client = None) -> dict:
     try:
-        # Save the PDF content to a temporary file
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
-            tmp_file.write(file_content)
-            tmp_path = tmp_file.name
-
-        # Extract text using PyPDF2
+        # Extract text using PyPDF2 straight from the in-memory content
         text_content = []
-        with open(tmp_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            total_pages = len(pdf_reader.pages)
+        pdf_reader = PyPDF2.PdfReader(BytesIO(file_content))
+        total_pages = len(pdf_reader.pages)
+        
+        # Update status to show page processing progress if Supabase is available
+        for page_num, page in enumerate(pdf_reader.pages):
             
-            # Update status to show page processing progress if Supabase is available
-            for page_num, page in enumerate(pdf_reader.pages):
-                
-                # Update processing status with page progress (only if Supabase is available)
-                if supabase and user_id:
-                    try:
-                        progress_status = f"processing_{doc_type}_page_{page_num+1}_of_{total_pages}"
-                        supabase.table("user_documents").update({
-                            "processing_status": progress_status
-                        }).eq("user_id", user_id).execute()
-                    except Exception as e:
-                        print(f"Warning: Could not update Supabase status: {str(e)}")
-                        # Continue processing even if Supabase update fails
-                
+            # Update processing status with page progress (only if Supabase is available)
+            if supabase and user_id:
                 try:
-                    text = page.extract_text()
-                    # Ensure text is a string and not empty
-                    if isinstance(text, str) and text.strip():
-                        text_content.append(text)
-                    elif isinstance(text, list):
-                        # If text is a list, join it with spaces
-                        text = ' '.join(str(item) for item in text if item)
-                        if text.strip():
-                            text_content.append(text)
+                    progress_status = f"processing_{doc_type}_page_{page_num+1}_of_{total_pages}"
+                    supabase.table("user_documents").update({
+                        "processing_status": progress_status
+                    }).eq("user_id", user_id).execute()
                 except Exception as e:
-                    print(f"Error extracting text from page {page_num + 1}: {str(e)}")
-                    continue
-
-        # Clean up temporary file
-        os.unlink(tmp_path)
+                    print(f"Warning: Could not update Supabase status: {str(e)}")
+                    # Continue processing even if Supabase update fails
+            
+            try:
+                text = page.extract_text()
+                # Ensure text is a string and not empty
+                if isinstance(text, str) and text.strip():
+                    text_content.append(text)
+                elif isinstance(text, list):
+                    # If text is a list, join it with spaces
+                    text = ' '.join(str(item) for item in text if item)
+                    if text.strip():
+                        text_content.append(text)
+            except Exception as e:
+                print(f"Error extracting text from page {page_num + 1}: {str(e)}")
+                continue
 
         # Join all text content and ensure it's a string
         full_text = "\n".join(text_content) if text_content else ""
@@ -2,18 +2,24 @@
 import os
 import sys
 import json
+import hashlib
+import itertools
 import logging
+import random
 import re
+import time
 import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any, Union
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, Any, Union
 from io import BytesIO
 
 # Add the parent directory to the path to import from api
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import functions from validate-documents.py
-from api.validate_documents import (
+from api.validate_documents import (  # type: ignore[import-not-found]
     process_pdf_content,
     get_supabase,
     parse_summary,
@@ -21,6 +27,31 @@ from api.validate_documents import (
     calculate_field_statistics
 )
 
+try:
+    from api.validate_documents import write_rag_responses
+except ImportError:
+    write_rag_responses = None  # type: ignore[assignment]
+
+try:
+    import fitz  # type: ignore[import-untyped, import-not-found]  # PyMuPDF
+except ImportError:
+    fitz = None  # type: ignore[assignment]
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import re2  # type: ignore[import-untyped, import-not-found]
+except ImportError:
+    re2 = None  # type: ignore[assignment]
+
+try:
+    import ahocorasick  # type: ignore[import-untyped, import-not-found]
+except ImportError:
+    ahocorasick = None  # type: ignore[assignment]
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -41,62 +72,287 @@ DOCUMENT_TYPES = [
     "i129"
 ]
 
+def _compile(pattern: str, flags: int = 0):
+    """Compile a pattern with RE2 when available, falling back to ``re``.
+
+    RE2 guarantees linear-time matching, which protects the extractors from
+    catastrophic backtracking on long or adversarial text. Patterns RE2
+    cannot handle (e.g. ``\\Z``) are compiled with the standard engine.
+    """
+    if re2 is not None:
+        inline = ""
+        if flags & re.IGNORECASE:
+            inline += "i"
+        if flags & re.DOTALL:
+            inline += "s"
+        try:
+            return re2.compile(f"(?{inline}){pattern}" if inline else pattern)
+        except Exception:
+            pass
+    return re.compile(pattern, flags)
+
+# Precompiled regex patterns used by the field extractors
+_EMAIL_RE = _compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+_PHONE_RE = _compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+_SKILLS_RE = _compile(r'skills?[\s\n:]+(.*?)(?:\n\n|\Z)', re.IGNORECASE | re.DOTALL)
+_SPLIT_SKILLS_RE = _compile(r'[,•\n]')
+_DATE_LONG_RE = _compile(r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}\b')
+_RELATION_RE = _compile(r'(worked with|supervised|mentored|collaborated|professor|advisor|manager)[\s\w]{1,30}(for|over|during)[\s\w]{1,15}(\d+\s+\w+)', re.IGNORECASE)
+_NAME_RE = _compile(r'name:?\s*([A-Za-z\s\-\']{2,50})', re.IGNORECASE)
+_DATE_SHORT_RE = _compile(r'date:?\s*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', re.IGNORECASE)
+_ID_NUMBER_RE = _compile(r'(?:id|identification|case) number:?\s*([A-Z0-9\-]{4,20})', re.IGNORECASE)
+_O1_MARKER_RE = _compile(r'O-1|(?i:extraordinary ability)')
+
+# Common English words used for language detection, matched as whole
+# ASCII-letter tokens without lowercasing the text first
+_ENGLISH_STOPWORDS = frozenset({"the", "and", "to", "of", "in", "is", "with", "for", "this", "that"})
+_ENGLISH_STOPWORD_RE = _compile(
+    r'(?<![a-z])(?:' + "|".join(sorted(_ENGLISH_STOPWORDS)) + r')(?![a-z])',
+    re.IGNORECASE | re.ASCII
+)
+
+def _build_stopword_automaton():
+    """Build an Aho-Corasick automaton over every casing of the stopwords.
+
+    Registering all case variants lets the automaton scan the original text
+    in a single pass without lowercasing it first.
+    """
+    automaton = ahocorasick.Automaton()
+    for word in _ENGLISH_STOPWORDS:
+        for chars in itertools.product(*((c.lower(), c.upper()) for c in word)):
+            automaton.add_word("".join(chars), word)
+    automaton.make_automaton()
+    return automaton
+
+# Shared by every document; None when pyahocorasick is not installed
+_STOPWORD_AUTOMATON = _build_stopword_automaton() if ahocorasick is not None else None
+
+def _is_ascii_letter(char: str) -> bool:
+    return ("a" <= char <= "z") or ("A" <= char <= "Z")
+
+# Sizes of the per-process memoization caches for repeated documents. Each
+# extracted text entry holds a whole document, so only a few are kept.
+_TEXT_CACHE_SIZE = 16
+_FIELD_CACHE_SIZE = 256
+
+# Extracted PDF text keyed by a digest of the file content
+_TEXT_CACHE: Dict[bytes, Tuple[str, int]] = {}
+
+# Regex extractor fields keyed by (digest of the document text, extractor).
+# Only 16-byte digests are kept, so entries never hold on to whole documents.
+_FIELD_CACHE: Dict[Tuple[bytes, str], Dict[str, Any]] = {}
+
+def _text_digest(text: str) -> bytes:
+    """Compact cache key for a document's text."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+def _copy_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy memoized extractor fields, so callers can modify their lists."""
+    return {key: list(value) if isinstance(value, list) else value for key, value in fields.items()}
+
+def _memoized_fields(text: str, kind: str, extract: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+    """Run a regex extractor once per distinct text and return a copy.
+
+    The text is hashed once per call; the oldest entry is evicted once the
+    cache is full.
+    """
+    key = (_text_digest(text), kind)
+    fields = _FIELD_CACHE.get(key)
+    if fields is None:
+        fields = extract(text)
+        if len(_FIELD_CACHE) >= _FIELD_CACHE_SIZE:
+            _FIELD_CACHE.pop(next(iter(_FIELD_CACHE)))
+        _FIELD_CACHE[key] = fields
+    return _copy_fields(fields)
+
+# Documents with at least this many pages are split across a caller's
+# executor, in tasks of this many pages
+_PARALLEL_PAGE_THRESHOLD = 16
+_PAGES_PER_TASK = 8
+
+def _extract_page_range(args: Tuple[bytes, int, int]) -> List[str]:
+    """Extract the text of pages [start, stop) in a worker process.
+
+    PyMuPDF documents cannot be shared between threads, so every worker
+    opens its own copy of the document.
+    """
+    file_content, start, stop = args
+    with fitz.open(stream=file_content, filetype="pdf") as doc:
+        return [doc[page_num].get_text() for page_num in range(start, stop)]
+
+# Per-process extractor used by process_batch workers
+_worker_extractor: Optional["DataExtractor"] = None
+
+# Set in process_batch workers, which must not start pools of their own
+_in_worker = False
+
+def _init_worker(output_dir: str, secure_ids: bool) -> None:
+    """Create one DataExtractor per worker process."""
+    global _worker_extractor, _in_worker
+    _in_worker = True
+    _worker_extractor = DataExtractor(output_dir=output_dir, secure_ids=secure_ids)
+
+@lru_cache(maxsize=1)
+def _timestamp_for_second(second: int) -> str:
+    """Format a whole-second Unix time as an ISO timestamp."""
+    return datetime.fromtimestamp(second).isoformat()
+
+def _current_timestamp() -> str:
+    """Current ISO timestamp, formatted at most once per second."""
+    return _timestamp_for_second(int(time.time()))
+
+# Non-cryptographic source for document ids, seeded once per process
+_id_rng = random.Random(os.urandom(32))
+
+def _reseed_id_rng() -> None:
+    """Give forked processes their own id stream."""
+    _id_rng.seed(os.urandom(32))
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_id_rng)
+
+def _fast_uuid() -> str:
+    """Generate a UUID4-formatted id without a syscall per call."""
+    value = _id_rng.getrandbits(128)
+    # Set the version (4) and RFC 4122 variant bits
+    value = (value & ~(0xF000 << 64)) | (0x4000 << 64)
+    value = (value & ~(0xC000 << 48)) | (0x8000 << 48)
+    hex_id = f"{value:032x}"
+    return f"{hex_id[:8]}-{hex_id[8:12]}-{hex_id[12:16]}-{hex_id[16:20]}-{hex_id[20:]}"
+
+def _process_one(kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Tuple[str, Dict[str, Any]]]]:
+    """Process a single document inside a worker process.
+
+    The output file is not written here; it is handed back to the parent
+    so the whole batch can be flushed together.
+    """
+    extractor = _worker_extractor
+    assert extractor is not None, "worker not initialized"
+    result = extractor.process_document(defer_write=True, **kwargs)
+    pending = extractor._pending_writes
+    extractor._pending_writes = []
+    return result, pending
+
 class DataExtractor:
     """Extract and standardize data from O-1 visa application documents"""
     
-    def __init__(self, output_dir: str = "data/training/processed"):
+    def __init__(self, output_dir: str = "data/training/processed", secure_ids: bool = False):
         """Initialize the data extractor.
         
         Args:
             output_dir: Directory to save processed data
+            secure_ids: Generate document ids with uuid.uuid4() instead of
+                the faster non-cryptographic generator
         """
         self.output_dir = output_dir
+        self.secure_ids = secure_ids
         os.makedirs(output_dir, exist_ok=True)
         logger.info(f"Data will be saved to: {output_dir}")
         
         # Create subdirectories for each document type
-        for doc_type in DOCUMENT_TYPES:
-            os.makedirs(os.path.join(output_dir, doc_type), exist_ok=True)
+        self._doc_dirs = {doc_type: os.path.join(output_dir, doc_type) for doc_type in DOCUMENT_TYPES}
+        for doc_dir in self._doc_dirs.values():
+            os.makedirs(doc_dir, exist_ok=True)
         
         # Initialize Supabase client (if available)
         self.supabase = get_supabase()
+        
+        # (output_file, data) pairs waiting for flush_pending_writes()
+        self._pending_writes: List[Tuple[str, Dict[str, Any]]] = []
             
-    def extract_text_from_pdf(self, file_content: bytes) -> Tuple[str, int]:
+    def extract_text_from_pdf(self, file_content: bytes, executor: Optional[Executor] = None) -> Tuple[str, int]:
         """Extract text from a PDF file.
         
+        Pages are extracted sequentially. A caller extracting many long
+        documents can pass a long-lived process pool, across which the pages
+        of long documents are then split.
+        
         Args:
             file_content: PDF file content in bytes
+            executor: Optional pool for the pages of long documents (ignored
+                inside process_batch workers)
             
         Returns:
             Tuple of (extracted text, number of pages)
         """
-        # Use the PDF processing function from validate-documents.py
+        cache_key = hashlib.blake2b(file_content, digest_size=16).digest()
+        cached = _TEXT_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        if _in_worker:
+            # Batch workers already use every core
+            executor = None
+        
+        if fitz is not None:
+            # PyMuPDF's C backend reads the bytes directly, no temp file needed
+            try:
+                with fitz.open(stream=file_content, filetype="pdf") as doc:
+                    total_pages = doc.page_count
+                    pool = executor if total_pages >= _PARALLEL_PAGE_THRESHOLD else None
+                    if pool is None:
+                        pages_text = [page.get_text() for page in doc]
+                
+                if pool is not None:
+                    ranges = [
+                        (file_content, start, min(start + _PAGES_PER_TASK, total_pages))
+                        for start in range(0, total_pages, _PAGES_PER_TASK)
+                    ]
+                    pages_text = [
+                        text
+                        for chunk in pool.map(_extract_page_range, ranges)
+                        for text in chunk
+                    ]
+                
+                text_content = [text for text in pages_text if text.strip()]
+                return self._cache_text(cache_key, ("\n".join(text_content), total_pages))
+            except Exception as e:
+                logger.error(f"Error extracting text from PDF: {str(e)}")
+                return "", 0
+        
+        # Fall back to the PDF processing function from validate-documents.py
         result = process_pdf_content(file_content, "generic", None, None)
         
         # Extract the needed information from the result
         if result and "extracted_text" in result:
             full_text = result["extracted_text"]
             total_pages = result.get("pages", 0)
-            return full_text, total_pages
+            return self._cache_text(cache_key, (full_text, total_pages))
         else:
             logger.error("Error extracting text from PDF")
             return "", 0
     
-    def extract_fields_from_text(self, text: str, doc_type: str) -> Dict[str, Any]:
+    @staticmethod
+    def _cache_text(cache_key: bytes, extracted: Tuple[str, int]) -> Tuple[str, int]:
+        """Remember extracted text, evicting the oldest entry when full."""
+        if len(_TEXT_CACHE) >= _TEXT_CACHE_SIZE:
+            _TEXT_CACHE.pop(next(iter(_TEXT_CACHE)))
+        _TEXT_CACHE[cache_key] = extracted
+        return extracted
+    
+    def extract_fields_from_text(self, text: str, doc_type: str, keep_full_text: bool = True,
+                                 now: Optional[str] = None) -> Dict[str, Any]:
         """Extract key fields from text based on document type.
         
         Args:
             text: The extracted text from the document
             doc_type: Type of document being processed
+            keep_full_text: Store the full text in the result; when False only
+                its SHA-256 digest is stored
+            now: ISO timestamp to record as the extraction date (defaults to
+                the current second)
             
         Returns:
             Dictionary of extracted fields
         """
         extracted_fields = {
             "doc_type": doc_type,
-            "extraction_date": datetime.now().isoformat(),
-            "full_text": text
+            "extraction_date": now or _current_timestamp()
         }
+        if keep_full_text:
+            extracted_fields["full_text"] = text
+        else:
+            extracted_fields["full_text_sha256"] = hashlib.sha256(text.encode('utf-8')).hexdigest()
         
         try:
             # Use OpenAI processing from validate-documents.py for a more comprehensive analysis
@@ -113,26 +369,34 @@ class DataExtractor:
                 extracted_fields["language"] = self._detect_language(text)
                 
                 # Add specific extraction based on document type
-                if doc_type == "resume":
-                    extracted_fields.update(self._extract_resume_fields(text))
-                elif doc_type == "recommendations":
-                    extracted_fields.update(self._extract_recommendation_fields(text))
-                elif doc_type in ["i129", "o1"]:
-                    extracted_fields.update(self._extract_form_fields(text, doc_type))
+                extracted_fields.update(self._extract_doc_type_fields(text, doc_type))
         except Exception as e:
             logger.error(f"Error extracting fields from text: {str(e)}")
             # Fall back to basic extraction if OpenAI processing fails
             extracted_fields["language"] = self._detect_language(text)
             
-            if doc_type == "resume":
-                extracted_fields.update(self._extract_resume_fields(text))
-            elif doc_type == "recommendations":
-                extracted_fields.update(self._extract_recommendation_fields(text))
-            elif doc_type in ["i129", "o1"]:
-                extracted_fields.update(self._extract_form_fields(text, doc_type))
+            extracted_fields.update(self._extract_doc_type_fields(text, doc_type))
         
         return extracted_fields
     
+    def _extract_doc_type_fields(self, text: str, doc_type: str) -> Dict[str, Any]:
+        """Extract the fields specific to a document type.
+        
+        Args:
+            text: The extracted text from the document
+            doc_type: Type of document being processed
+            
+        Returns:
+            Dictionary of document type fields
+        """
+        if doc_type == "resume":
+            return _memoized_fields(text, doc_type, self._extract_resume_fields)
+        elif doc_type == "recommendations":
+            return _memoized_fields(text, doc_type, self._extract_recommendation_fields)
+        elif doc_type in ["i129", "o1"]:
+            return self._extract_form_fields(text, doc_type)
+        return {}
+    
     def _detect_language(self, text: str) -> str:
         """Simple language detection (English vs non-English).
         
@@ -142,12 +406,28 @@ class DataExtractor:
         Returns:
             Detected language code
         """
-        # Count common English words
-        english_words = ["the", "and", "to", "of", "in", "is", "with", "for", "this", "that"]
-        word_count = sum(1 for word in english_words if f" {word} " in f" {text.lower()} ")
-        
-        # If at least 3 common English words are found, assume it's English
-        return "en" if word_count >= 3 else "unknown"
+        # Count distinct common English words, stopping as soon as there
+        # are at least 3 of them, in which case assume it's English
+        seen = set()
+        if _STOPWORD_AUTOMATON is not None:
+            for end, word in _STOPWORD_AUTOMATON.iter(text):
+                start = end - len(word) + 1
+                # Only whole tokens count, as with the regex below
+                if start > 0 and _is_ascii_letter(text[start - 1]):
+                    continue
+                if end + 1 < len(text) and _is_ascii_letter(text[end + 1]):
+                    continue
+                seen.add(word)
+                if len(seen) >= 3:
+                    return "en"
+            return "unknown"
+        
+        for match in _ENGLISH_STOPWORD_RE.finditer(text):
+            seen.add(match.group(0).lower())
+            if len(seen) >= 3:
+                return "en"
+        
+        return "unknown"
     
     def _extract_resume_fields(self, text: str) -> Dict[str, Any]:
         """Extract key fields from a resume.
@@ -158,7 +438,7 @@ class DataExtractor:
         Returns:
             Dictionary of resume fields
         """
-        fields = {
+        fields: Dict[str, Any] = {
             "name": None,
             "email": None,
             "phone": None,
@@ -169,22 +449,22 @@ class DataExtractor:
         }
         
         # Basic email extraction
-        email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+        email_match = _EMAIL_RE.search(text)
         if email_match:
             fields["email"] = email_match.group(0)
         
         # Basic phone extraction
-        phone_match = re.search(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text)
+        phone_match = _PHONE_RE.search(text)
         if phone_match:
             fields["phone"] = phone_match.group(0)
         
         # Simple skill extraction (look for skill sections)
-        skills_section = re.search(r'(?i)skills?[\s\n:]+(.*?)(?:\n\n|\Z)', text, re.DOTALL)
+        skills_section = _SKILLS_RE.search(text)
         if skills_section:
             # Extract individual skills
             skills_text = skills_section.group(1)
             # Split by common separators
-            skills = re.split(r'[,•\n]', skills_text)
+            skills = _SPLIT_SKILLS_RE.split(skills_text)
             fields["skills"] = [skill.strip() for skill in skills if skill.strip()]
         
         return fields
@@ -198,7 +478,7 @@ class DataExtractor:
         Returns:
             Dictionary of recommendation fields
         """
-        fields = {
+        fields: Dict[str, Any] = {
             "recommender_name": None,
             "recommender_title": None,
             "recommender_organization": None,
@@ -208,12 +488,12 @@ class DataExtractor:
         }
         
         # Extract date
-        date_match = re.search(r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}\b', text)
+        date_match = _DATE_LONG_RE.search(text)
         if date_match:
             fields["recommendation_date"] = date_match.group(0)
         
         # Extract simple relationship context if present
-        relationship_match = re.search(r'(?i)(worked with|supervised|mentored|collaborated|professor|advisor|manager)[\s\w]{1,30}(for|over|during)[\s\w]{1,15}(\d+\s+\w+)', text)
+        relationship_match = _RELATION_RE.search(text)
         if relationship_match:
             fields["relationship"] = relationship_match.group(0)
         
@@ -230,35 +510,32 @@ class DataExtractor:
             Dictionary of form fields
         """
         # Check if this is an O-1 form
-        is_o1 = "O-1" in text or "extraordinary ability" in text.lower()
+        is_o1 = _O1_MARKER_RE.search(text) is not None
+        form_content = _memoized_fields(text, "form_content", self._extract_simple_form_content)
         
         # For O-1 forms, try to use the write_rag_responses function from validate-documents.py
-        try:
-            # Import write_rag_responses from validate-documents.py if not already imported
-            from api.validate_documents import write_rag_responses
-            
-            # Use write_rag_responses to get form field values
-            response_dict = write_rag_responses(
-                extra_info="You're analyzing a form document.",
-                extracted_text=text
-            )
-            
-            # If we got a response, return it
-            if response_dict:
-                return {
-                    "form_type": "O-1" if is_o1 else doc_type.upper(),
-                    "form_fields": response_dict,
-                    "raw_text": text,
-                    "form_content": self._extract_simple_form_content(text)
-                }
-        except Exception as e:
-            logger.error(f"Error using write_rag_responses: {str(e)}")
+        if write_rag_responses is not None:
+            try:
+                # Use write_rag_responses to get form field values
+                response_dict = write_rag_responses(
+                    extra_info="You're analyzing a form document.",
+                    extracted_text=text
+                )
+                
+                # If we got a response, return it
+                if response_dict:
+                    return {
+                        "form_type": "O-1" if is_o1 else doc_type.upper(),
+                        "form_fields": response_dict,
+                        "form_content": form_content
+                    }
+            except Exception as e:
+                logger.error(f"Error using write_rag_responses: {str(e)}")
         
         # Fallback to simple extraction
         return {
             "form_type": "O-1" if is_o1 else doc_type.upper(),
-            "raw_text": text,
-            "form_content": self._extract_simple_form_content(text)
+            "form_content": form_content
         }
     
     def _extract_simple_form_content(self, text: str) -> Dict[str, Any]:
@@ -273,37 +550,85 @@ class DataExtractor:
         form_content = {}
         
         # Try to extract name fields
-        name_match = re.search(r'(?i)name:?\s*([A-Za-z\s\-\']{2,50})', text)
+        name_match = _NAME_RE.search(text)
         if name_match:
             form_content["name"] = name_match.group(1).strip()
         
         # Try to extract dates
-        date_match = re.search(r'(?i)date:?\s*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', text)
+        date_match = _DATE_SHORT_RE.search(text)
         if date_match:
             form_content["date"] = date_match.group(1).strip()
         
         # Try to extract IDs
-        id_match = re.search(r'(?i)(?:id|identification|case) number:?\s*([A-Z0-9\-]{4,20})', text)
+        id_match = _ID_NUMBER_RE.search(text)
         if id_match:
             form_content["id_number"] = id_match.group(1).strip()
         
         return form_content
+
+    def _write_json_atomic(self, data: Dict[str, Any], output_file: str) -> None:
+        """Write JSON to a temporary file and atomically move it into place.
+
+        A killed process can then never leave a truncated file at ``output_file``.
+
+        Args:
+            data: Data to serialize
+            output_file: Final path of the JSON file
+        """
+        tmp_file = output_file + ".tmp"
+        try:
+            with open(tmp_file, 'wb') as f:
+                if orjson is not None:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+                else:
+                    f.write(json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, output_file)
+        except Exception:
+            # Don't leave a partial temporary file behind
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+
+    def flush_pending_writes(self, max_workers: Optional[int] = None) -> None:
+        """Write all deferred output files concurrently.
+        
+        Args:
+            max_workers: Number of writer threads
+        """
+        pending, self._pending_writes = self._pending_writes, []
+        if not pending:
+            return
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # list() surfaces the first write error, if any
+            list(executor.map(lambda item: self._write_json_atomic(item[1], item[0]), pending))
+        
+        logger.info(f"Saved {len(pending)} processed documents to: {self.output_dir}")
     
-    def process_document(self, file_content: bytes, doc_type: str, metadata: Dict = None) -> Dict[str, Any]:
+    def process_document(self, file_content: bytes, doc_type: str, metadata: Optional[Dict] = None,
+                         defer_write: bool = False, keep_full_text: bool = True,
+                         now: Optional[str] = None) -> Dict[str, Any]:
         """Process a document and extract structured data.
         
         Args:
             file_content: Document file content in bytes
             doc_type: Type of document
             metadata: Additional metadata about the document
+            defer_write: Queue the output file for flush_pending_writes()
+                instead of writing it immediately
+            keep_full_text: Store the full document text in the result
+            now: ISO timestamp to record as the processing date (defaults to
+                the current second)
             
         Returns:
             Dictionary of extracted data and metadata
         """
         result = {
-            "doc_id": str(uuid.uuid4()),
+            "doc_id": str(uuid.uuid4()) if self.secure_ids else _fast_uuid(),
             "doc_type": doc_type,
-            "processing_date": datetime.now().isoformat(),
+            "processing_date": now or _current_timestamp(),
             "metadata": metadata or {}
         }
         
@@ -327,15 +652,17 @@ class DataExtractor:
                 full_text = processed_result["extracted_text"]
                 
                 # Extract fields from the text
-                fields = self.extract_fields_from_text(full_text, doc_type)
+                fields = self.extract_fields_from_text(full_text, doc_type, keep_full_text, now)
                 result.update(fields)
                 
                 # Save the processed data to a file
-                output_file = os.path.join(self.output_dir, doc_type, f"{result['doc_id']}.json")
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, indent=2, ensure_ascii=False)
-                
-                logger.info(f"Saved processed data to: {output_file}")
+                doc_dir = self._doc_dirs.get(doc_type) or os.path.join(self.output_dir, doc_type)
+                output_file = os.path.join(doc_dir, f"{result['doc_id']}.json")
+                if defer_write:
+                    self._pending_writes.append((output_file, result))
+                else:
+                    self._write_json_atomic(result, output_file)
+                    logger.info(f"Saved processed data to: {output_file}")
             else:
                 result["error"] = "Failed to extract text from document"
         except Exception as e:
@@ -344,28 +671,56 @@ class DataExtractor:
         
         return result
     
-    def process_batch(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def process_batch(self, documents: List[Dict[str, Any]], max_workers: Optional[int] = None,
+                      keep_full_text: bool = True) -> List[Dict[str, Any]]:
         """Process a batch of documents.
         
+        Documents are processed in this process unless ``max_workers`` asks
+        for a pool of worker processes; each worker builds its own extractor
+        and Supabase client, so a pool only pays off for large batches.
+        Results are returned in input order, and their output files are
+        written together once the whole batch is done.
+        
         Args:
             documents: List of dictionaries with keys:
                 - file_content: Document file content in bytes
                 - doc_type: Type of document
                 - metadata: (Optional) Additional metadata
+            max_workers: Number of worker processes (None or 1 processes
+                the documents in this process)
+            keep_full_text: Store the full document text in each result
                 
         Returns:
             List of processing results
         """
-        results = []
-        
-        for doc_data in documents:
-            file_content = doc_data["file_content"]
-            doc_type = doc_data["doc_type"]
-            metadata = doc_data.get("metadata", {})
-            
-            result = self.process_document(file_content, doc_type, metadata)
-            results.append(result)
-        
+        # All documents of a batch share one timestamp
+        batch_timestamp = datetime.now().isoformat()
+        tasks = [
+            {
+                "file_content": doc_data["file_content"],
+                "doc_type": doc_data["doc_type"],
+                "metadata": doc_data.get("metadata", {}),
+                "keep_full_text": keep_full_text,
+                "now": batch_timestamp
+            }
+            for doc_data in documents
+        ]
+        
+        # Workers never start nested pools
+        if max_workers is None or max_workers <= 1 or len(tasks) <= 1 or _in_worker:
+            results = [self.process_document(defer_write=True, **task) for task in tasks]
+        else:
+            results = []
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(self.output_dir, self.secure_ids)
+            ) as executor:
+                for result, pending in executor.map(_process_one, tasks):
+                    results.append(result)
+                    self._pending_writes.extend(pending)
+        
+        self.flush_pending_writes()
         return results
 
 # If running directly, show usage example
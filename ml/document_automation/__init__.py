@@ -3,13 +3,45 @@ Document Automation Module for O-1 Visa Application Pipeline.
 
 This module provides models and tools for automatically filling
 O-1 visa application forms using trained models and templates.
+
+Public names are imported lazily on first access (PEP 562), so importing
+a lightweight component does not pay for loading torch and the full
+training pipeline.
 """
 
-from .data_loader import SyntheticDataLoader, DocumentPairDataset
-from .template_processor import DocumentTemplate, TemplateFiller
-from .model_architecture import DocumentFillingModel, create_model, save_model, load_model
-from .training_pipeline import Tokenizer, FormFillingTrainer, train_model
-from .form_interface import FormFillingInterface, verify_model_and_templates
-from .evaluation import FormFillingEvaluator, evaluate_model
+import importlib
+
+_LAZY = {
+    "SyntheticDataLoader": ".data_loader",
+    "DocumentPairDataset": ".data_loader",
+    "DocumentTemplate": ".template_processor",
+    "TemplateFiller": ".template_processor",
+    "DocumentFillingModel": ".model_architecture",
+    "create_model": ".model_architecture",
+    "save_model": ".model_architecture",
+    "load_model": ".model_architecture",
+    "Tokenizer": ".training_pipeline",
+    "FormFillingTrainer": ".training_pipeline",
+    "train_model": ".training_pipeline",
+    "FormFillingInterface": ".form_interface",
+    "verify_model_and_templates": ".form_interface",
+    "FormFillingEvaluator": ".evaluation",
+    "evaluate_model": ".evaluation",
+}
+
+__all__ = list(_LAZY)
+
+__version__ = "0.1.0"
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
 
-__version__ = "0.1.0" 
\ No newline at end of file
+def __dir__():
+    return sorted(list(globals()) + __all__)
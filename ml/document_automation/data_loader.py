@@ -8,14 +8,28 @@ for training document automation models.
 
 import os
 import json
+import hashlib
 import logging
-import random
+import queue
+import sys
+import threading
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Any, Tuple, Optional, Union, Iterator
 import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
+from .field_walk import extract_fields
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,6 +41,149 @@ logger = logging.getLogger(__name__)
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent
 DATA_DIR = ROOT_DIR / "data" / "training" / "synthetic"
 
+# Bookkeeping keys that are not form fields
+SKIP_FIELD_KEYS = frozenset({"generator_type", "source_file", "doc_id", "generated_date"})
+
+# Single-file cache of the parsed corpus, stored in the data directory
+CACHE_FILENAME = "synthetic_cache.json"
+
+# Form field mappings for the cached corpus, stored next to it
+FIELD_MAPPING_CACHE_FILENAME = "synthetic_fields.json"
+
+# End-of-stream marker passed from the batch prefetch thread
+_END_OF_BATCHES = object()
+
+
+def _read_json_file(json_file: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """Read and parse one synthetic JSON file, returning None on failure."""
+    try:
+        # Unbuffered: the whole file is read in one call, so a BufferedReader
+        # would only add an extra allocation and copy per file
+        with open(json_file, "rb", buffering=0) as f:
+            raw = f.read()
+        # orjson parses the UTF-8 bytes directly, without decoding to str first
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except Exception as e:
+        logger.error(f"Error loading {json_file}: {str(e)}")
+        return None
+
+
+def _write_json_atomic(path: Path, obj: Any):
+    """Write JSON to a temporary file and move it into place."""
+    tmp_file = path.with_name(path.name + ".tmp")
+    with open(tmp_file, "wb") as f:
+        if orjson is not None:
+            f.write(orjson.dumps(obj))
+        else:
+            f.write(json.dumps(obj).encode("utf-8"))
+    os.replace(tmp_file, path)
+
+
+def _intern_keys(obj: Any) -> Any:
+    """Rebuild a parsed document with interned dict keys.
+
+    Every document repeats the same key strings ("personal_info",
+    "first_name", ...); interning makes them share one object each.
+    """
+    if isinstance(obj, dict):
+        return {
+            sys.intern(key) if isinstance(key, str) else key: _intern_keys(value)
+            for key, value in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_intern_keys(item) for item in obj]
+    return obj
+
+
+class _IndexedView(Sequence):
+    """Read-only view of selected positions in a shared document list.
+    
+    Splits hold one of these per document type instead of a copied list,
+    so the documents are only referenced from ``SyntheticDataLoader.data``.
+    """
+    
+    def __init__(self, base: List[Dict[str, Any]], indices: np.ndarray):
+        self.base = base
+        self.indices = indices
+    
+    def __len__(self) -> int:
+        return len(self.indices)
+    
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return self.take(self.indices[idx], positions=True)
+        return self.base[self.indices[idx]]
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return map(self.base.__getitem__, self.indices.tolist())
+    
+    def take(self, idx: np.ndarray, positions: bool = False) -> List[Dict[str, Any]]:
+        """Gather several documents at once.
+        
+        Args:
+            idx: Indices into this view (or into ``base`` if ``positions``)
+            positions: Whether ``idx`` already holds positions in ``base``
+            
+        Returns:
+            List of the selected documents
+        """
+        selected = (idx if positions else self.indices[idx]).tolist()
+        # itemgetter returns a bare item, not a tuple, for one index
+        if len(selected) > 1:
+            return list(itemgetter(*selected)(self.base))
+        return [self.base[i] for i in selected]
+
+
+# Field path -> compiled lookup steps, shared by all DocumentPairs
+_PATH_CACHE: Dict[str, Tuple[Tuple[str, Any], ...]] = {}
+
+
+def _compile_path(path: str) -> Tuple[Tuple[str, Any], ...]:
+    """Parse a field path into lookup steps, caching the result.
+
+    "education[0].university" compiles to
+    (('k', 'education'), ('i', 0), ('k', 'university')).
+
+    Args:
+        path: Path to the field (e.g., "personal_info.first_name")
+
+    Returns:
+        Tuple of ('k', key) and ('i', index) steps
+    """
+    steps = _PATH_CACHE.get(path)
+    if steps is not None:
+        return steps
+
+    compiled: List[Tuple[str, Any]] = []
+    for part in path.split("."):
+        # Handle array indices in the path (e.g., education[0].university)
+        if "[" in part and "]" in part:
+            array_name, index_str = part.split("[", 1)
+            compiled.append(("k", array_name))
+            compiled.append(("i", int(index_str.split("]")[0])))
+        else:
+            compiled.append(("k", part))
+
+    steps = _PATH_CACHE[path] = tuple(compiled)
+    return steps
+
+
+def _walk(data: Any, steps: Tuple[Tuple[str, Any], ...]) -> Any:
+    """Follow compiled path steps through a document, or return None."""
+    value = data
+    for kind, arg in steps:
+        if kind == "k":
+            if arg in value:
+                value = value[arg]
+            else:
+                return None
+        elif type(value) is list and 0 <= arg < len(value):
+            value = value[arg]
+        else:
+            return None
+    return value
+
+
 class SyntheticDataLoader:
     """Loader for synthetic training data."""
     
@@ -37,7 +194,9 @@ class SyntheticDataLoader:
         doc_types: Optional[List[str]] = None,
         validation_split: float = 0.2,
         test_split: float = 0.1,
-        seed: int = 42
+        seed: int = 42,
+        num_workers: Optional[int] = None,
+        use_cache: bool = True
     ):
         """Initialize the synthetic data loader.
         
@@ -48,6 +207,9 @@ class SyntheticDataLoader:
             validation_split: Fraction of data to use for validation
             test_split: Fraction of data to use for testing
             seed: Random seed for reproducibility
+            num_workers: Number of threads used to read files (default: ThreadPoolExecutor default)
+            use_cache: Reuse (and write) a single-file cache of the parsed corpus,
+                and of its form field mappings, while the source files are unchanged
         """
         self.data_dir = Path(data_dir) if data_dir else DATA_DIR
         self.include_generators = include_generators or ["rule_based", "rl_based", "advanced_rl"]
@@ -55,10 +217,15 @@ class SyntheticDataLoader:
         self.validation_split = validation_split
         self.test_split = test_split
         self.seed = seed
+        self.num_workers = num_workers
+        self.use_cache = use_cache
+        self.cache_file = self.data_dir / CACHE_FILENAME
+        self.field_mapping_file = self.data_dir / FIELD_MAPPING_CACHE_FILENAME
         
-        # Set random seed for reproducibility
-        random.seed(seed)
-        np.random.seed(seed)
+        # Instance-local RNG for batch sampling, leaving global state alone.
+        # Each batch generator shuffles with its own child of the seed.
+        self._seed_seq = np.random.SeedSequence(seed)
+        self._rng = np.random.default_rng(self._seed_seq)
         
         # Initialize data storage
         self.data = {}
@@ -66,6 +233,12 @@ class SyntheticDataLoader:
         self.val_data = {}
         self.test_data = {}
         
+        # Positions into self.data[doc_type] for each split
+        self.split_indices = {"train": {}, "val": {}, "test": {}}
+        
+        # get_form_field_mapping results per document type
+        self._field_mapping_cache: Dict[str, Dict[str, List[Any]]] = {}
+        
         # Track statistics
         self.stats = {
             "total_examples": 0,
@@ -88,6 +261,7 @@ class SyntheticDataLoader:
         
         # Reset data
         self.data = {doc_type: [] for doc_type in self.doc_types}
+        self._field_mapping_cache.clear()
         
         # Track stats by generator
         for generator in self.include_generators:
@@ -97,71 +271,196 @@ class SyntheticDataLoader:
         for doc_type in self.doc_types:
             self.stats["by_doc_type"][doc_type] = 0
         
-        # Load data for each generator and document type
-        for generator in self.include_generators:
-            generator_dir = self.data_dir / generator
+        # Collect the files for each generator and document type
+        work = self._collect_files()
+        
+        fingerprint = self._corpus_fingerprint(work)
+        cached = self._read_cache(fingerprint) if self.use_cache else None
+        
+        if cached is not None:
+            logger.info(f"Loaded {len(work)} files from cache {self.cache_file}")
+            for doc_type in self.doc_types:
+                for doc_data in cached.get(doc_type, []):
+                    self._add_document(doc_type, doc_data)
+        else:
+            # Read and parse the files in parallel; map keeps the original order
+            with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+                loaded = executor.map(_read_json_file, [json_file for json_file, _, _ in work])
+                for (json_file, generator, doc_type), doc_data in tqdm(
+                    zip(work, loaded), total=len(work), desc="Loading synthetic data"
+                ):
+                    if doc_data is None:
+                        continue
+                    
+                    # Add generator and source file information
+                    doc_data["generator_type"] = generator
+                    doc_data["source_file"] = str(json_file)
+                    
+                    self._add_document(doc_type, doc_data)
             
-            if not generator_dir.exists():
-                logger.warning(f"Generator directory not found: {generator_dir}")
+            if self.use_cache:
+                self._write_cache(fingerprint)
+        
+        # Split the data into train, validation, and test sets
+        self._split_data()
+        
+        # Field mappings depend on the split, so they are cached after it
+        if self.use_cache and not self._load_field_mappings(fingerprint):
+            self._write_field_mappings(fingerprint)
+        
+        logger.info(f"Loaded {self.stats['total_examples']} examples in total")
+        logger.info(f"Train: {self.stats['by_split']['train']}, "
+                    f"Validation: {self.stats['by_split']['val']}, "
+                    f"Test: {self.stats['by_split']['test']}")
+        
+        return self.stats
+    
+    def _collect_files(self) -> List[Tuple[str, str, str]]:
+        """List the JSON files to load, in generator and document type order.
+        
+        The data directory is traversed once with os.walk, pruned to the
+        selected generators and document types, rather than probing each
+        (generator, doc_type) directory separately.
+        
+        Returns:
+            (json_file, generator, doc_type) entries to be loaded
+        """
+        generators = set(self.include_generators)
+        doc_types = set(self.doc_types)
+        found_generators = set()
+        manifest: Dict[Tuple[str, ...], List[str]] = {}
+        
+        for root, dirs, files in os.walk(self.data_dir, followlinks=True):
+            parts = Path(root).relative_to(self.data_dir).parts
+            if not parts:
+                dirs[:] = [d for d in dirs if d in generators]
+                found_generators.update(dirs)
+            elif len(parts) == 1:
+                dirs[:] = [d for d in dirs if d in doc_types]
+            else:
+                dirs[:] = []
+                manifest[parts] = [
+                    os.path.join(root, name) for name in files if name.endswith(".json")
+                ]
+        
+        work = []
+        for generator in self.include_generators:
+            if generator not in found_generators:
+                logger.warning(f"Generator directory not found: {self.data_dir / generator}")
                 continue
             
             for doc_type in self.doc_types:
-                doc_type_dir = generator_dir / doc_type
+                json_files = manifest.get((generator, doc_type))
                 
-                if not doc_type_dir.exists():
-                    logger.warning(f"Document type directory not found: {doc_type_dir}")
+                if json_files is None:
+                    logger.warning(f"Document type directory not found: {self.data_dir / generator / doc_type}")
                     continue
                 
-                # Load all JSON files in the document type directory
-                json_files = list(doc_type_dir.glob("*.json"))
-                
                 if not json_files:
-                    logger.warning(f"No JSON files found in {doc_type_dir}")
+                    logger.warning(f"No JSON files found in {self.data_dir / generator / doc_type}")
                     continue
                 
                 logger.info(f"Loading {len(json_files)} {doc_type} files from {generator}")
-                
-                for json_file in tqdm(json_files, desc=f"Loading {generator}/{doc_type}"):
-                    try:
-                        with open(json_file, "r", encoding="utf-8") as f:
-                            doc_data = json.load(f)
-                            
-                            # Add generator and source file information
-                            doc_data["generator_type"] = generator
-                            doc_data["source_file"] = str(json_file)
-                            
-                            self.data[doc_type].append(doc_data)
-                            
-                            # Update statistics
-                            self.stats["total_examples"] += 1
-                            self.stats["by_generator"][generator] += 1
-                            self.stats["by_doc_type"][doc_type] += 1
-                    
-                    except Exception as e:
-                        logger.error(f"Error loading {json_file}: {str(e)}")
+                work.extend((json_file, generator, doc_type) for json_file in json_files)
         
-        # Split the data into train, validation, and test sets
-        self._split_data()
+        return work
+    
+    def _add_document(self, doc_type: str, doc_data: Dict[str, Any]):
+        """Store a loaded document and update the statistics."""
+        doc_data = _intern_keys(doc_data)
+        self.data[doc_type].append(doc_data)
+        
+        # Update statistics
+        self.stats["total_examples"] += 1
+        self.stats["by_generator"][doc_data["generator_type"]] += 1
+        self.stats["by_doc_type"][doc_type] += 1
+    
+    def _corpus_fingerprint(self, work: List[Tuple[str, str, str]]) -> str:
+        """Fingerprint the selected source files by path, size and mtime.
         
-        logger.info(f"Loaded {self.stats['total_examples']} examples in total")
-        logger.info(f"Train: {self.stats['by_split']['train']}, "
-                    f"Validation: {self.stats['by_split']['val']}, "
-                    f"Test: {self.stats['by_split']['test']}")
+        Args:
+            work: (json_file, generator, doc_type) entries to be loaded
+            
+        Returns:
+            Hex digest identifying the current state of the corpus
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((self.include_generators, self.doc_types)).encode("utf-8"))
+        for json_file, generator, doc_type in work:
+            stat = os.stat(json_file)
+            digest.update(f"{json_file}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _read_cache(self, fingerprint: str) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """Return the cached corpus if it matches the fingerprint."""
+        if not self.cache_file.exists():
+            return None
+        
+        cache = _read_json_file(self.cache_file)
+        if not cache or cache.get("fingerprint") != fingerprint:
+            return None
+        return cache.get("data")
+    
+    def _write_cache(self, fingerprint: str):
+        """Write the loaded corpus to the single-file cache."""
+        cache = {"fingerprint": fingerprint, "data": self.data}
+        try:
+            _write_json_atomic(self.cache_file, cache)
+        except OSError as e:
+            logger.warning(f"Could not write data cache {self.cache_file}: {str(e)}")
+    
+    def _field_mapping_key(self, fingerprint: str) -> List[Any]:
+        """Identify the corpus and split that field mappings were built from."""
+        # Value order in a mapping follows the split order
+        return [fingerprint, self.seed, self.validation_split, self.test_split]
+    
+    def _load_field_mappings(self, fingerprint: str) -> bool:
+        """Restore cached field mappings for the current corpus and split.
         
-        return self.stats
+        Returns:
+            Whether matching mappings were found
+        """
+        if not self.field_mapping_file.exists():
+            return False
+        
+        cache = _read_json_file(self.field_mapping_file)
+        if not cache or cache.get("key") != self._field_mapping_key(fingerprint):
+            return False
+        
+        self._field_mapping_cache.update(cache.get("mappings", {}))
+        return True
+    
+    def _write_field_mappings(self, fingerprint: str):
+        """Build the field mapping of every document type and cache them."""
+        for doc_type in self.doc_types:
+            self.get_form_field_mapping(doc_type)
+        
+        cache = {
+            "key": self._field_mapping_key(fingerprint),
+            "mappings": self._field_mapping_cache
+        }
+        try:
+            _write_json_atomic(self.field_mapping_file, cache)
+        except OSError as e:
+            logger.warning(f"Could not write field mapping cache {self.field_mapping_file}: {str(e)}")
     
     def _split_data(self):
         """Split the loaded data into train, validation, and test sets."""
-        # Reset split data
-        self.train_data = {doc_type: [] for doc_type in self.doc_types}
-        self.val_data = {doc_type: [] for doc_type in self.doc_types}
-        self.test_data = {doc_type: [] for doc_type in self.doc_types}
+        self._field_mapping_cache.clear()
+        
+        # Reset split data; each split is a view over self.data
+        self.train_data = {}
+        self.val_data = {}
+        self.test_data = {}
+        
+        rng = np.random.default_rng(self.seed)
         
         # For each document type, split the data
         for doc_type in self.doc_types:
-            # Shuffle the data
-            doc_data = self.data[doc_type].copy()
-            random.shuffle(doc_data)
+            doc_data = self.data[doc_type]
+            
+            # Shuffle positions instead of copying and shuffling the documents
+            perm = rng.permutation(len(doc_data))
             
             # Calculate split indices
             n_samples = len(doc_data)
@@ -170,9 +469,11 @@ class SyntheticDataLoader:
             n_train = n_samples - n_test - n_val
             
             # Split the data
-            self.train_data[doc_type] = doc_data[:n_train]
-            self.val_data[doc_type] = doc_data[n_train:n_train+n_val]
-            self.test_data[doc_type] = doc_data[n_train+n_val:]
+            self.split_indices["train"][doc_type] = perm[:n_train]
+            self.split_indices["val"][doc_type] = perm[n_train:n_train+n_val]
+            self.split_indices["test"][doc_type] = perm[n_train+n_val:]
+            for split, split_data in (("train", self.train_data), ("val", self.val_data), ("test", self.test_data)):
+                split_data[doc_type] = _IndexedView(doc_data, self.split_indices[split][doc_type])
             
             # Update statistics
             self.stats["by_split"]["train"] += n_train
@@ -206,7 +507,7 @@ class SyntheticDataLoader:
             raise ValueError(f"No data available for {doc_type} in {split} split")
         
         # Sample a batch of examples
-        batch = random.sample(data, min(batch_size, len(data)))
+        batch = data.take(self._rng.choice(len(data), size=min(batch_size, len(data)), replace=False))
         
         return batch
     
@@ -216,20 +517,85 @@ class SyntheticDataLoader:
         doc_type: str, 
         split: str = "train", 
         shuffle: bool = True,
-        epochs: Optional[int] = None
+        epochs: Optional[int] = None,
+        prefetch: int = 2
     ) -> Iterator[List[Dict[str, Any]]]:
         """Generate batches for training or evaluation.
         
+        Batches are assembled on a background thread and up to ``prefetch``
+        of them are kept ready while the caller consumes the current one.
+        Each generator shuffles with its own RNG spawned from the loader's
+        seed, so for a given seed the batch order does not depend on
+        ``prefetch`` or on get_batch calls made while it runs.
+        
         Args:
             batch_size: Number of examples per batch
             doc_type: Type of document to generate batches for
             split: Which split to use (train, val, test)
             shuffle: Whether to shuffle the data between epochs
             epochs: Number of epochs to generate (None for infinite)
+            prefetch: Number of batches to prepare ahead (0 disables the
+                background thread)
             
         Yields:
             Batches of document examples
         """
+        # Spawned here, on the consumer's thread, so the producer thread
+        # never touches the RNG that get_batch uses
+        rng = np.random.default_rng(self._seed_seq.spawn(1)[0])
+        batches = self._generate_batches(batch_size, doc_type, split, shuffle, epochs, rng)
+        
+        if prefetch <= 0:
+            yield from batches
+            return
+        
+        ready: "queue.Queue[Any]" = queue.Queue(maxsize=prefetch)
+        stop = threading.Event()
+        
+        def put(item: Any) -> bool:
+            # Wait for room in the queue, giving up once the consumer is gone
+            while not stop.is_set():
+                try:
+                    ready.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
+            try:
+                for batch in batches:
+                    if not put(batch):
+                        return
+            except Exception as e:
+                put((_END_OF_BATCHES, e))
+                return
+            put((_END_OF_BATCHES, None))
+        
+        producer = threading.Thread(target=produce, name="batch-prefetch", daemon=True)
+        producer.start()
+        
+        try:
+            while True:
+                item = ready.get()
+                if type(item) is tuple and item[0] is _END_OF_BATCHES:
+                    if item[1] is not None:
+                        raise item[1]
+                    return
+                yield item
+        finally:
+            stop.set()
+    
+    def _generate_batches(
+        self, 
+        batch_size: int, 
+        doc_type: str, 
+        split: str, 
+        shuffle: bool,
+        epochs: Optional[int],
+        rng: np.random.Generator
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Assemble batches synchronously (see batch_generator)."""
         if doc_type not in self.doc_types:
             raise ValueError(f"Unknown document type: {doc_type}")
         
@@ -249,15 +615,14 @@ class SyntheticDataLoader:
         while epochs is None or epoch < epochs:
             # Shuffle the data if requested
             if shuffle:
-                indices = np.random.permutation(len(data))
+                indices = rng.permutation(len(data))
             else:
                 indices = np.arange(len(data))
             
             # Generate batches
             for start_idx in range(0, len(indices), batch_size):
                 end_idx = min(start_idx + batch_size, len(indices))
-                batch_indices = indices[start_idx:end_idx]
-                batch = [data[idx] for idx in batch_indices]
+                batch = data.take(indices[start_idx:end_idx])
                 
                 yield batch
             
@@ -270,69 +635,58 @@ class SyntheticDataLoader:
             doc_type: Type of document to get fields for
             
         Returns:
-            Dictionary mapping field names to possible values
+            Dictionary mapping field names to possible values. The result is
+            cached per document type and shared between callers, so treat it
+            as read-only.
         """
         if doc_type not in self.doc_types:
             raise ValueError(f"Unknown document type: {doc_type}")
         
-        field_mapping = {}
+        if doc_type in self._field_mapping_cache:
+            return self._field_mapping_cache[doc_type]
         
-        # Combine all data for this document type
-        all_data = (
-            self.train_data.get(doc_type, []) + 
-            self.val_data.get(doc_type, []) + 
+        # Field name -> distinct values, using dict keys as an ordered set
+        field_values: Dict[str, Dict[Any, None]] = {}
+        
+        # All data for this document type, split by split
+        splits = [
+            self.train_data.get(doc_type, []),
+            self.val_data.get(doc_type, []),
             self.test_data.get(doc_type, [])
-        )
+        ]
         
-        if not all_data:
+        if not any(splits):
             logger.warning(f"No data available for {doc_type}")
-            return field_mapping
+            return {}
         
         # Extract all fields and their values
-        for doc in all_data:
-            self._extract_fields_recursive(doc, "", field_mapping)
+        for doc in chain.from_iterable(splits):
+            self._extract_fields(doc, field_values)
         
+        field_mapping = {field_name: list(values) for field_name, values in field_values.items()}
+        self._field_mapping_cache[doc_type] = field_mapping
         return field_mapping
     
-    def _extract_fields_recursive(
+    def _extract_fields(
         self, 
         obj: Any, 
-        prefix: str, 
-        field_mapping: Dict[str, List[Any]]
+        field_values: Dict[str, Dict[Any, None]]
     ):
-        """Recursively extract fields from a nested object.
+        """Extract fields from a nested object.
         
         Args:
             obj: Object to extract fields from
-            prefix: Prefix for field names
-            field_mapping: Dictionary to update with field mappings
+            field_values: Field name -> ordered set of values, updated in place
         """
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                # Skip special keys
-                if key in ["generator_type", "source_file", "doc_id", "generated_date"]:
-                    continue
-                
-                field_name = f"{prefix}.{key}" if prefix else key
-                
-                if isinstance(value, (dict, list)):
-                    self._extract_fields_recursive(value, field_name, field_mapping)
-                else:
-                    if field_name not in field_mapping:
-                        field_mapping[field_name] = []
-                    
-                    if value is not None and value not in field_mapping[field_name]:
-                        field_mapping[field_name].append(value)
-        
-        elif isinstance(obj, list):
-            for i, item in enumerate(obj):
-                list_prefix = f"{prefix}[{i}]"
-                self._extract_fields_recursive(item, list_prefix, field_mapping)
+        extract_fields(obj, field_values, SKIP_FIELD_KEYS)
 
 
 class DocumentPair:
     """Represents a pair of document data and its filled template."""
     
+    # Datasets create one pair per sample, so avoid a per-instance __dict__
+    __slots__ = ("document_data", "template_file", "doc_type", "has_template")
+    
     def __init__(
         self, 
         document_data: Dict[str, Any],
@@ -351,6 +705,33 @@ class DocumentPair:
         # Check if filled template is available
         self.has_template = self.template_file is not None and self.template_file.exists()
     
+    @classmethod
+    def from_precomputed(
+        cls,
+        document_data: Dict[str, Any],
+        template_file: Optional[Path],
+        has_template: bool
+    ) -> "DocumentPair":
+        """Create a document pair whose template existence is already known.
+        
+        Skips the filesystem check in __init__, for callers that build many
+        pairs sharing one template.
+        
+        Args:
+            document_data: Document data in dictionary format
+            template_file: Path to template file (if available)
+            has_template: Whether the template file exists
+            
+        Returns:
+            Document pair
+        """
+        pair = cls.__new__(cls)
+        pair.document_data = document_data
+        pair.template_file = template_file
+        pair.doc_type = document_data.get("doc_type", "unknown")
+        pair.has_template = has_template
+        return pair
+    
     def get_field_value(self, field_path: str) -> Any:
         """Get the value of a specific field.
         
@@ -360,30 +741,7 @@ class DocumentPair:
         Returns:
             Value of the field
         """
-        parts = field_path.split(".")
-        value = self.document_data
-        
-        for part in parts:
-            # Handle array indices in the path (e.g., education[0].university)
-            if "[" in part and "]" in part:
-                array_name, index_str = part.split("[", 1)
-                index = int(index_str.split("]")[0])
-                
-                if array_name in value:
-                    array_value = value[array_name]
-                    if isinstance(array_value, list) and 0 <= index < len(array_value):
-                        value = array_value[index]
-                    else:
-                        return None
-                else:
-                    return None
-            else:
-                if part in value:
-                    value = value[part]
-                else:
-                    return None
-        
-        return value
+        return _walk(self.document_data, _compile_path(field_path))
     
     def to_feature_vector(self, field_mapping: Dict[str, List[Any]]) -> Dict[str, Any]:
         """Convert document data to a feature vector for model input.
@@ -400,7 +758,7 @@ class DocumentPair:
             value = self.get_field_value(field)
             
             # Handle different types of values
-            if isinstance(value, bool):
+            if value is True or value is False:
                 features[field] = int(value)
             elif isinstance(value, (int, float)):
                 features[field] = value
@@ -448,6 +806,15 @@ class DocumentPairDataset:
         
         # Get field mapping
         self.field_mapping = data_loader.get_form_field_mapping(doc_type)
+        
+        # Shared across get_batch calls so successive batches differ
+        self._rng = np.random.default_rng(data_loader.seed)
+        
+        # Every pair shares one template, so resolve and stat it once
+        self._template_file = (
+            self.template_dir / f"{self.doc_type}_template.pdf" if self.template_dir else None
+        )
+        self._template_exists = self._template_file is not None and self._template_file.exists()
     
     def __len__(self) -> int:
         """Get the number of document pairs in the dataset."""
@@ -455,15 +822,9 @@ class DocumentPairDataset:
     
     def __getitem__(self, idx: int) -> DocumentPair:
         """Get a document pair by index."""
-        document_data = self.data[idx]
-        
-        # Find template file if template directory is provided
-        template_file = None
-        if self.template_dir:
-            template_filename = f"{self.doc_type}_template.pdf"
-            template_file = self.template_dir / template_filename
-        
-        return DocumentPair(document_data, template_file)
+        return DocumentPair.from_precomputed(
+            self.data[idx], self._template_file, self._template_exists
+        )
     
     def get_batch(self, batch_size: int, shuffle: bool = True) -> List[DocumentPair]:
         """Get a batch of document pairs.
@@ -476,7 +837,8 @@ class DocumentPairDataset:
             List of document pairs
         """
         if shuffle:
-            indices = np.random.randint(0, len(self.data), min(batch_size, len(self.data)))
+            # Sample without replacement so a batch never repeats a document
+            indices = self._rng.choice(len(self.data), size=min(batch_size, len(self.data)), replace=False)
         else:
             start_idx = 0
             end_idx = min(batch_size, len(self.data))
@@ -490,20 +852,20 @@ class DocumentPairDataset:
         Returns:
             DataFrame containing document data
         """
-        # Flatten the document data
-        flattened_data = []
+        # Compile the field paths once rather than per document
+        paths = [(field, _compile_path(field)) for field in self.field_mapping]
         
-        for document_data in self.data:
-            flat_doc = {}
-            
-            # Extract fields using the field mapping
-            for field in self.field_mapping:
-                doc_pair = DocumentPair(document_data)
-                flat_doc[field] = doc_pair.get_field_value(field)
-            
-            flattened_data.append(flat_doc)
+        # One preallocated column per field, filled in a single pass over the
+        # documents, instead of an intermediate dict per row
+        n = len(self.data)
+        columns = {field: np.empty(n, dtype=object) for field, _ in paths}
+        
+        for i, document_data in enumerate(self.data):
+            for field, steps in paths:
+                columns[field][i] = _walk(document_data, steps)
         
-        return pd.DataFrame(flattened_data)
+        # Narrow the object columns to the dtypes pandas would have inferred
+        return pd.DataFrame(columns, copy=False).infer_objects()
 
 
 # For testing
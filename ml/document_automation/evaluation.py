@@ -9,22 +9,29 @@ the document filling model and conducting comprehensive testing.
 import os
 import json
 import logging
+import re
 import time
+from concurrent.futures import ProcessPoolExecutor
 import torch
 import numpy as np
-import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import Dict, List, Any, Optional, Sequence, Union, Tuple
 from tqdm import tqdm
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support
 import difflib
-import Levenshtein
+from rapidfuzz.distance import Levenshtein
+from rapidfuzz.process import cpdist
 import nltk
 from nltk.translate.bleu_score import sentence_bleu
 from nltk.translate.meteor_score import meteor_score
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import local modules
-from .data_loader import SyntheticDataLoader, DocumentPairDataset
+from .data_loader import SyntheticDataLoader
 from .model_architecture import load_model
 from .training_pipeline import Tokenizer
 from .form_interface import FormFillingInterface
@@ -41,6 +48,20 @@ ROOT_DIR = Path(__file__).resolve().parent.parent.parent
 MODEL_DIR = ROOT_DIR / "data" / "models"
 RESULTS_DIR = ROOT_DIR / "data" / "evaluation"
 
+# Minimum number of distinct predictions worth scoring in worker processes
+_PARALLEL_SCORE_THRESHOLD = 256
+
+# Structured values: digits with separators (dates, phone numbers, amounts),
+# a single token containing a digit (IDs, receipt numbers), or a date with
+# the month written out
+_STRUCTURED_VALUE_RE = re.compile(
+    r'[\d\s\-/.,:()+#$%]*\d[\d\s\-/.,:()+#$%]*'
+    r'|\S*\d\S*'
+    r'|(?:January|February|March|April|May|June|July|August|September|October|November|December)'
+    r'\s+\d{1,2},?\s+\d{4}',
+    re.IGNORECASE
+)
+
 # Download NLTK resources if needed
 try:
     nltk.data.find('wordnet')
@@ -48,23 +69,108 @@ except LookupError:
     nltk.download('wordnet')
 
 
+def _write_results(results: Dict[str, Any], results_file: Path):
+    """Write evaluation results as indented JSON."""
+    with open(results_file, "wb") as f:
+        if orjson is not None:
+            # NON_STR_KEYS writes a None field name as "null", like json
+            f.write(orjson.dumps(
+                results,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ))
+        else:
+            f.write(json.dumps(results, indent=2).encode("utf-8"))
+
+
+def _score_text_pair(true_value: str, predicted_value: str) -> Tuple[float, float]:
+    """Calculate the BLEU and METEOR scores of one normalized prediction.
+    
+    Args:
+        true_value: True value
+        predicted_value: Predicted value
+        
+    Returns:
+        Tuple of (BLEU score, METEOR score)
+    """
+    reference = [true_value.split()]
+    candidate = predicted_value.split()
+    
+    # Calculate BLEU score
+    if candidate and true_value:
+        if predicted_value == true_value and len(candidate) >= 4:
+            # Every n-gram precision and the brevity penalty are exactly 1.
+            # Shorter exact matches still go through NLTK, which scores
+            # them near 0 for lack of 4-grams.
+            bleu = 1.0
+        else:
+            try:
+                bleu = sentence_bleu(reference, candidate, weights=(0.25, 0.25, 0.25, 0.25))
+            except:
+                bleu = 0.0
+    else:
+        bleu = 1.0 if (not true_value and not predicted_value) else 0.0
+    
+    # Calculate METEOR score
+    if candidate and true_value:
+        try:
+            meteor = meteor_score(reference, candidate)
+        except:
+            meteor = 0.0
+    else:
+        meteor = 1.0 if (not true_value and not predicted_value) else 0.0
+    
+    return bleu, meteor
+
+
+def _is_structured_value(value: Any) -> bool:
+    """Check whether a true value is structured, like a date, number or ID."""
+    if value is None:
+        return False
+    return _STRUCTURED_VALUE_RE.fullmatch(" ".join(str(value).split())) is not None
+
+
+def _score_text_pair_chunk(text_pairs: List[Tuple[str, str]]) -> List[Tuple[float, float]]:
+    """Score a chunk of text pairs in a worker process."""
+    return [_score_text_pair(*text_pair) for text_pair in text_pairs]
+
+
 class PredictionMetrics:
-    """Calculate metrics for field value predictions."""
+    """Calculate metrics for field value predictions.
     
-    def __init__(self):
-        """Initialize prediction metrics."""
+    Scoring is deferred to get_metrics: character errors are computed in
+    one batched rapidfuzz call, and BLEU and METEOR once per distinct
+    (true, predicted) pair. Values the caller marks as structured (dates,
+    phone numbers, IDs) are not scored with BLEU and METEOR, which
+    degenerate on them; both scores are taken as 1.0 for an exact match and
+    0.0 otherwise.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        """Initialize prediction metrics.
+        
+        Args:
+            max_workers: Number of worker processes used to score BLEU and
+                METEOR (defaults to CPU count, 1 scores in this process)
+        """
+        self.max_workers = max_workers
         self.exact_match_count = 0
         self.total_count = 0
-        self.character_errors = []
-        self.bleu_scores = []
-        self.meteor_scores = []
-        self.field_specific_metrics = {}
+        self.text_pairs = []
+        
+        # Per-prediction columns, aggregated by field in get_metrics
+        self.field_names = []
+        self.exact_matches = []
+        self.structured = []
+        
+        # (true value, predicted value) -> (BLEU, METEOR)
+        self._text_scores: Dict[Tuple[str, str], Tuple[float, float]] = {}
     
     def add_prediction(
         self,
         field_name: str,
         predicted_value: str,
-        true_value: str
+        true_value: str,
+        structured: bool = False
     ):
         """Add a prediction result for evaluation.
         
@@ -72,6 +178,8 @@ class PredictionMetrics:
             field_name: Name of the field
             predicted_value: Predicted value
             true_value: True value
+            structured: Field type hint, whether the value is structured
+                and scored by exact match instead of BLEU and METEOR
         """
         # Handle None values
         predicted_value = str(predicted_value) if predicted_value is not None else ""
@@ -89,58 +197,64 @@ class PredictionMetrics:
         
         self.total_count += 1
         
-        # Calculate character error rate
-        if true_value:
-            char_error = Levenshtein.distance(predicted_value, true_value) / len(true_value)
-        else:
-            char_error = 1.0 if predicted_value else 0.0
-        
-        self.character_errors.append(char_error)
-        
-        # Calculate BLEU score
-        reference = [true_value.split()]
-        candidate = predicted_value.split()
-        
-        if candidate and true_value:
-            try:
-                bleu = sentence_bleu(reference, candidate, weights=(0.25, 0.25, 0.25, 0.25))
-            except:
-                bleu = 0.0
-        else:
-            bleu = 1.0 if (not true_value and not predicted_value) else 0.0
-        
-        self.bleu_scores.append(bleu)
-        
-        # Calculate METEOR score
-        if candidate and true_value:
-            try:
-                meteor = meteor_score(reference, candidate)
-            except:
-                meteor = 0.0
-        else:
-            meteor = 1.0 if (not true_value and not predicted_value) else 0.0
-        
-        self.meteor_scores.append(meteor)
-        
-        # Track field-specific metrics
-        if field_name not in self.field_specific_metrics:
-            self.field_specific_metrics[field_name] = {
-                "exact_match_count": 0,
-                "total_count": 0,
-                "character_errors": [],
-                "bleu_scores": [],
-                "meteor_scores": []
-            }
-        
-        field_metrics = self.field_specific_metrics[field_name]
-        
-        if is_exact_match:
-            field_metrics["exact_match_count"] += 1
-        
-        field_metrics["total_count"] += 1
-        field_metrics["character_errors"].append(char_error)
-        field_metrics["bleu_scores"].append(bleu)
-        field_metrics["meteor_scores"].append(meteor)
+        # Character errors, BLEU and METEOR are scored in get_metrics
+        self.text_pairs.append((true_value, predicted_value))
+        self.field_names.append(field_name)
+        self.exact_matches.append(is_exact_match)
+        self.structured.append(structured)
+    
+    def __iadd__(self, other: "PredictionMetrics") -> "PredictionMetrics":
+        """Merge the predictions recorded by another metrics object."""
+        self.exact_match_count += other.exact_match_count
+        self.total_count += other.total_count
+        self.text_pairs.extend(other.text_pairs)
+        self.field_names.extend(other.field_names)
+        self.exact_matches.extend(other.exact_matches)
+        self.structured.extend(other.structured)
+        self._text_scores.update(other._text_scores)
+        return self
+    
+    def _character_errors(self) -> np.ndarray:
+        """Calculate the character error rate of every prediction."""
+        true_values = [true_value for true_value, _ in self.text_pairs]
+        predicted_values = [predicted_value for _, predicted_value in self.text_pairs]
+        
+        # Pairwise distances in a single multithreaded rapidfuzz call
+        distances = cpdist(
+            predicted_values, true_values, scorer=Levenshtein.distance, workers=-1
+        ).astype(np.float64)
+        lengths = np.fromiter(map(len, true_values), dtype=np.float64, count=len(true_values))
+        
+        # An empty true value scores 1.0 for any non-empty prediction
+        return np.where(
+            lengths > 0,
+            distances / np.where(lengths > 0, lengths, 1.0),
+            (distances > 0).astype(np.float64)
+        )
+    
+    def _score_text_pairs(self) -> Dict[Tuple[str, str], Tuple[float, float]]:
+        """Score every distinct text pair that has not been scored yet."""
+        scores = self._text_scores
+        pending = list(dict.fromkeys(
+            text_pair
+            for text_pair, structured in zip(self.text_pairs, self.structured)
+            if not structured and text_pair not in scores
+        ))
+        
+        if self.max_workers == 1 or len(pending) < _PARALLEL_SCORE_THRESHOLD:
+            for text_pair in pending:
+                scores[text_pair] = _score_text_pair(*text_pair)
+            return scores
+        
+        # NLTK scoring is pure Python, so spread it over worker processes
+        workers = min(self.max_workers or os.cpu_count() or 1, len(pending))
+        chunk_size = -(-len(pending) // (workers * 4))
+        chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk, chunk_scores in zip(chunks, executor.map(_score_text_pair_chunk, chunks)):
+                scores.update(zip(chunk, chunk_scores))
+        return scores
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get evaluation metrics.
@@ -157,26 +271,56 @@ class PredictionMetrics:
                 "field_specific_metrics": {}
             }
         
-        # Calculate overall metrics
-        exact_match_accuracy = self.exact_match_count / self.total_count
-        character_error_rate = np.mean(self.character_errors)
-        bleu_score = np.mean(self.bleu_scores)
-        meteor_score = np.mean(self.meteor_scores)
+        character_errors = self._character_errors()
+        scores = self._score_text_pairs()
+        exact_matches = np.asarray(self.exact_matches, dtype=np.float64)
         
-        # Calculate field-specific metrics
-        field_metrics = {}
+        # Structured values score their exact match for both BLEU and METEOR
+        text_scores = np.array([
+            scores[text_pair] if not structured else (exact_match, exact_match)
+            for text_pair, structured, exact_match in zip(
+                self.text_pairs, self.structured, exact_matches
+            )
+        ], dtype=np.float64)
+        bleu_scores = text_scores[:, 0]
+        meteor_scores = text_scores[:, 1]
         
-        for field_name, metrics in self.field_specific_metrics.items():
-            if metrics["total_count"] == 0:
-                continue
-            
-            field_metrics[field_name] = {
-                "exact_match_accuracy": metrics["exact_match_count"] / metrics["total_count"],
-                "character_error_rate": np.mean(metrics["character_errors"]),
-                "bleu_score": np.mean(metrics["bleu_scores"]),
-                "meteor_score": np.mean(metrics["meteor_scores"]),
-                "sample_count": metrics["total_count"]
+        # Calculate overall metrics
+        exact_match_accuracy = self.exact_match_count / self.total_count
+        character_error_rate = np.mean(character_errors)
+        bleu_score = np.mean(bleu_scores)
+        meteor_score = np.mean(meteor_scores)
+        
+        # Calculate field-specific metrics. Fields get integer codes in order
+        # of first appearance (keeping names such as None as they are), and
+        # each metric is summed per field in a single bincount pass
+        field_codes: Dict[Any, int] = {}
+        codes = np.fromiter(
+            (field_codes.setdefault(name, len(field_codes)) for name in self.field_names),
+            dtype=np.intp,
+            count=self.total_count
+        )
+        n_fields = len(field_codes)
+        sample_counts = np.bincount(codes, minlength=n_fields)
+        
+        def field_means(values: np.ndarray) -> np.ndarray:
+            return np.bincount(codes, weights=values, minlength=n_fields) / sample_counts
+        
+        exact_match_rates = field_means(exact_matches)
+        character_error_rates = field_means(character_errors)
+        field_bleu_scores = field_means(bleu_scores)
+        field_meteor_scores = field_means(meteor_scores)
+        
+        field_metrics = {
+            field_name: {
+                "exact_match_accuracy": float(exact_match_rates[code]),
+                "character_error_rate": float(character_error_rates[code]),
+                "bleu_score": float(field_bleu_scores[code]),
+                "meteor_score": float(field_meteor_scores[code]),
+                "sample_count": int(sample_counts[code])
             }
+            for field_name, code in field_codes.items()
+        }
         
         return {
             "exact_match_accuracy": exact_match_accuracy,
@@ -229,6 +373,66 @@ class FormFillingEvaluator:
         self.model = self.interface.model
         self.tokenizer = self.interface.tokenizer
     
+    def _load_test_documents(self, doc_type: str, max_samples: Optional[int]) -> Sequence[Dict[str, Any]]:
+        """Load the test split of a document type.
+        
+        Args:
+            doc_type: Type of document to evaluate
+            max_samples: Maximum number of samples to evaluate
+            
+        Returns:
+            Test documents, read in place from the loader's split rather than
+            copied or wrapped per sample
+        """
+        # Load test data
+        data_loader = SyntheticDataLoader(
+            data_dir=self.test_data_dir,
+            doc_types=[doc_type]
+        )
+        
+        data_loader.load_data()
+        
+        test_documents = data_loader.test_data.get(doc_type, [])
+        
+        # Limit the number of samples if specified. The subset is drawn from
+        # a generator seeded like the loader, so repeated evaluations use the
+        # same samples; shuffle=False skips ordering the picked indices
+        if max_samples and max_samples < len(test_documents):
+            rng = np.random.default_rng(data_loader.seed)
+            indices = rng.choice(len(test_documents), max_samples, replace=False, shuffle=False)
+            return [test_documents[i] for i in indices]
+        return test_documents
+    
+    def _encode_field_names(self, field_names: List[str]) -> torch.Tensor:
+        """Encode field names into one tensor on the device."""
+        return self.interface.encode_field_names(field_names, max_length=128)
+    
+    @staticmethod
+    def _field_type_metrics(true_types: List[Any], predicted_types: List[Any]) -> Dict[str, float]:
+        """Calculate field type classification metrics."""
+        accuracy = accuracy_score(true_types, predicted_types)
+        precision, recall, f1, _ = precision_recall_fscore_support(
+            true_types,
+            predicted_types,
+            average="weighted"
+        )
+        
+        return {
+            "accuracy": accuracy,
+            "precision": precision,
+            "recall": recall,
+            "f1_score": f1
+        }
+    
+    def _save_results(self, results: Dict[str, Any], name: str, description: str):
+        """Save evaluation results to a timestamped JSON file."""
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        results_file = self.results_dir / f"{name}_{timestamp}.json"
+        
+        _write_results(results, results_file)
+        
+        logger.info(f"{description} results saved to {results_file}")
+    
     def evaluate_test_set(
         self,
         doc_type: str = "o1",
@@ -245,67 +449,34 @@ class FormFillingEvaluator:
         Returns:
             Dictionary of evaluation metrics
         """
-        # Load test data
-        data_loader = SyntheticDataLoader(
-            data_dir=self.test_data_dir,
-            doc_types=[doc_type]
-        )
+        test_documents = self._load_test_documents(doc_type, max_samples)
         
-        data_loader.load_data()
+        # Extract field names and true values once; batches are slices
+        all_field_names = [document.get("field_name", "") for document in test_documents]
+        all_true_values = [document.get("field_value", "") for document in test_documents]
         
-        # Create test dataset
-        test_dataset = DocumentPairDataset(
-            data_loader=data_loader,
-            doc_type=doc_type,
-            split="test"
-        )
+        # Predictions depend only on the field name, so predict each
+        # distinct name once, in batches
+        unique_names = list(dict.fromkeys(all_field_names))
+        predictions = {}
         
-        # Limit the number of samples if specified
-        if max_samples and max_samples < len(test_dataset):
-            indices = np.random.choice(len(test_dataset), max_samples, replace=False)
-            test_samples = [test_dataset[i] for i in indices]
-        else:
-            test_samples = [test_dataset[i] for i in range(len(test_dataset))]
+        for i in tqdm(range(0, len(unique_names), batch_size), desc="Evaluating"):
+            predictions.update(self.interface.predict_field_values(unique_names[i:i+batch_size]))
         
-        # Initialize metrics
+        # Calculate metrics
         metrics = PredictionMetrics()
+        add_prediction = metrics.add_prediction
         
-        # Process samples in batches
-        for i in tqdm(range(0, len(test_samples), batch_size), desc="Evaluating"):
-            batch = test_samples[i:i+batch_size]
-            
-            # Extract field names and true values
-            batch_field_names = []
-            batch_true_values = []
-            
-            for sample in batch:
-                field_name = sample.document_data.get("field_name", "")
-                field_value = sample.document_data.get("field_value", "")
-                
-                batch_field_names.append(field_name)
-                batch_true_values.append(field_value)
-            
-            # Predict field values
-            predictions = self.interface.predict_field_values(batch_field_names)
-            
-            # Calculate metrics
-            for j, field_name in enumerate(batch_field_names):
-                predicted_value = predictions.get(field_name, "")
-                true_value = batch_true_values[j]
-                
-                metrics.add_prediction(field_name, predicted_value, true_value)
+        for field_name, true_value in zip(all_field_names, all_true_values):
+            add_prediction(
+                field_name, predictions.get(field_name, ""), true_value,
+                structured=_is_structured_value(true_value)
+            )
         
         # Get evaluation metrics
         results = metrics.get_metrics()
         
-        # Save results
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        results_file = self.results_dir / f"evaluation_{doc_type}_{timestamp}.json"
-        
-        with open(results_file, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2)
-        
-        logger.info(f"Evaluation results saved to {results_file}")
+        self._save_results(results, f"evaluation_{doc_type}", "Evaluation")
         
         return results
     
@@ -325,95 +496,112 @@ class FormFillingEvaluator:
         Returns:
             Dictionary of evaluation metrics for field type prediction
         """
-        # Load test data
-        data_loader = SyntheticDataLoader(
-            data_dir=self.test_data_dir,
-            doc_types=[doc_type]
-        )
+        test_documents = self._load_test_documents(doc_type, max_samples)
         
-        data_loader.load_data()
+        all_field_names = [document.get("field_name", "") for document in test_documents]
+        all_true_types = [document.get("field_type", 0) for document in test_documents]
         
-        # Create test dataset
-        test_dataset = DocumentPairDataset(
-            data_loader=data_loader,
-            doc_type=doc_type,
-            split="test"
-        )
+        # Types depend only on the field name, so run each distinct name
+        # through the same forward pass as evaluate_all, once
+        unique_names = list(dict.fromkeys(all_field_names))
+        encoded_names = self._encode_field_names(unique_names)
+        predicted_types = []
         
-        # Limit the number of samples if specified
-        if max_samples and max_samples < len(test_dataset):
-            indices = np.random.choice(len(test_dataset), max_samples, replace=False)
-            test_samples = [test_dataset[i] for i in indices]
-        else:
-            test_samples = [test_dataset[i] for i in range(len(test_dataset))]
+        # Set model to evaluation mode
+        self.model.eval()
         
-        # Initialize metrics
-        all_true_types = []
-        all_predicted_types = []
+        # Process field names in batches
+        for i in tqdm(range(0, len(unique_names), batch_size), desc="Evaluating field types"):
+            _, type_logits = self.interface.predict_encoded(encoded_names[i:i+batch_size])
+            predicted_types.extend(torch.argmax(type_logits, dim=-1).cpu().numpy())
+        
+        type_by_name = dict(zip(unique_names, predicted_types))
+        all_predicted_types = [type_by_name[field_name] for field_name in all_field_names]
+        
+        # Calculate metrics
+        results = self._field_type_metrics(all_true_types, all_predicted_types)
+        
+        self._save_results(results, f"field_type_evaluation_{doc_type}", "Field type evaluation")
+        
+        return results
+    
+    def evaluate_all(
+        self,
+        doc_type: str = "o1",
+        batch_size: int = 32,
+        max_samples: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Evaluate field values and field types in a single pass.
+        
+        Produces the results of evaluate_test_set and evaluate_field_types,
+        but the test set is loaded once and each batch goes through the
+        model once, using both its value and type outputs.
+        
+        Args:
+            doc_type: Type of document to evaluate
+            batch_size: Batch size for evaluation
+            max_samples: Maximum number of samples to evaluate
+            
+        Returns:
+            Dictionary with "test_results" and "type_results"
+        """
+        test_documents = self._load_test_documents(doc_type, max_samples)
+        
+        all_field_names = [document.get("field_name", "") for document in test_documents]
+        all_true_values = [document.get("field_value", "") for document in test_documents]
+        all_true_types = [document.get("field_type", 0) for document in test_documents]
+        
+        # Predictions depend only on the field name, so run each distinct
+        # name through the model once
+        unique_names = list(dict.fromkeys(all_field_names))
+        encoded_names = self._encode_field_names(unique_names)
+        predicted_values = []
+        predicted_types = []
         
         # Set model to evaluation mode
         self.model.eval()
         
-        # Process samples in batches
-        for i in tqdm(range(0, len(test_samples), batch_size), desc="Evaluating field types"):
-            batch = test_samples[i:i+batch_size]
-            
-            # Prepare input data
-            batch_field_names = []
-            batch_true_types = []
-            
-            for sample in batch:
-                field_name = sample.document_data.get("field_name", "")
-                field_type = sample.document_data.get("field_type", 0)
-                
-                batch_field_names.append(field_name)
-                batch_true_types.append(field_type)
-            
-            # Encode field names
-            encoded_names = [
-                self.tokenizer.encode(name, max_length=128)
-                for name in batch_field_names
-            ]
-            
-            # Convert to tensor
-            field_name_tensor = torch.tensor(encoded_names, dtype=torch.long).to(self.device)
-            
-            # Generate predictions
-            with torch.no_grad():
-                _, type_logits = self.model(field_name_tensor)
-                
-                # Get predicted types
-                predicted_types = torch.argmax(type_logits, dim=-1).cpu().numpy()
+        # Run the forward pass in float16 on GPUs; autocast is a no-op on CPU
+        use_autocast = torch.device(self.device).type == "cuda"
+        
+        # Process field names in batches
+        for i in tqdm(range(0, len(unique_names), batch_size), desc="Evaluating"):
+            with torch.inference_mode(), torch.autocast(
+                device_type="cuda", dtype=torch.float16, enabled=use_autocast
+            ):
+                batch_values, type_logits = self.interface.predict_encoded(
+                    encoded_names[i:i+batch_size]
+                )
+                batch_types = torch.argmax(type_logits, dim=-1).cpu().numpy()
             
-            # Track true and predicted types
-            all_true_types.extend(batch_true_types)
-            all_predicted_types.extend(predicted_types)
+            predicted_values.extend(batch_values)
+            predicted_types.extend(batch_types)
+        
+        value_by_name = dict(zip(unique_names, predicted_values))
+        type_by_name = dict(zip(unique_names, predicted_types))
         
         # Calculate metrics
-        accuracy = accuracy_score(all_true_types, all_predicted_types)
-        precision, recall, f1, _ = precision_recall_fscore_support(
-            all_true_types,
-            all_predicted_types,
-            average="weighted"
-        )
+        metrics = PredictionMetrics()
+        add_prediction = metrics.add_prediction
         
-        results = {
-            "accuracy": accuracy,
-            "precision": precision,
-            "recall": recall,
-            "f1_score": f1
-        }
+        for field_name, true_value in zip(all_field_names, all_true_values):
+            add_prediction(
+                field_name, value_by_name[field_name], true_value,
+                structured=_is_structured_value(true_value)
+            )
         
-        # Save results
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        results_file = self.results_dir / f"field_type_evaluation_{doc_type}_{timestamp}.json"
+        all_predicted_types = [type_by_name[field_name] for field_name in all_field_names]
         
-        with open(results_file, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2)
+        test_results = metrics.get_metrics()
+        type_results = self._field_type_metrics(all_true_types, all_predicted_types)
         
-        logger.info(f"Field type evaluation results saved to {results_file}")
+        self._save_results(test_results, f"evaluation_{doc_type}", "Evaluation")
+        self._save_results(type_results, f"field_type_evaluation_{doc_type}", "Field type evaluation")
         
-        return results
+        return {
+            "test_results": test_results,
+            "type_results": type_results
+        }
     
     def evaluate_form_filling(
         self,
@@ -458,6 +646,12 @@ class FormFillingEvaluator:
         # Initialize metrics
         metrics = PredictionMetrics()
         
+        # Samples share most field names, so predict each distinct name once
+        unique_names = list(dict.fromkeys(
+            field_name for sample in test_data for field_name in sample.get("field_values", {})
+        ))
+        all_predictions = self.interface.predict_field_values(unique_names) if unique_names else {}
+        
         # Process each sample
         for i, sample in enumerate(tqdm(test_data, desc="Filling forms")):
             # Extract true field values
@@ -466,8 +660,8 @@ class FormFillingEvaluator:
             # Get field names
             field_names = list(true_values.keys())
             
-            # Predict field values
-            predicted_values = self.interface.predict_field_values(field_names)
+            # Look up the predicted field values
+            predicted_values = {field_name: all_predictions[field_name] for field_name in field_names}
             
             # Fill the form
             output_file = output_dir / f"{template_name}_{i+1}.pdf"
@@ -483,7 +677,10 @@ class FormFillingEvaluator:
             for field_name, true_value in true_values.items():
                 predicted_value = predicted_values.get(field_name, "")
                 
-                metrics.add_prediction(field_name, predicted_value, true_value)
+                metrics.add_prediction(
+                    field_name, predicted_value, true_value,
+                    structured=_is_structured_value(true_value)
+                )
         
         # Get evaluation metrics
         results = metrics.get_metrics()
@@ -491,8 +688,7 @@ class FormFillingEvaluator:
         # Save results
         results_file = output_dir / f"evaluation_results.json"
         
-        with open(results_file, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2)
+        _write_results(results, results_file)
         
         logger.info(f"Form filling evaluation results saved to {results_file}")
         
@@ -527,13 +723,15 @@ def evaluate_model(
         results_dir=results_dir
     )
     
-    # Evaluate test set
-    logger.info("Evaluating test set...")
-    test_results = evaluator.evaluate_test_set(
+    # Evaluate field values and field types in one pass over the test set
+    logger.info("Evaluating test set and field type prediction...")
+    all_results = evaluator.evaluate_all(
         doc_type=doc_type,
         batch_size=batch_size,
         max_samples=max_samples
     )
+    test_results = all_results["test_results"]
+    type_results = all_results["type_results"]
     
     logger.info(f"Test set evaluation results:")
     logger.info(f"  Exact match accuracy: {test_results['exact_match_accuracy']:.4f}")
@@ -541,14 +739,6 @@ def evaluate_model(
     logger.info(f"  BLEU score: {test_results['bleu_score']:.4f}")
     logger.info(f"  METEOR score: {test_results['meteor_score']:.4f}")
     
-    # Evaluate field type prediction
-    logger.info("Evaluating field type prediction...")
-    type_results = evaluator.evaluate_field_types(
-        doc_type=doc_type,
-        batch_size=batch_size,
-        max_samples=max_samples
-    )
-    
     logger.info(f"Field type prediction results:")
     logger.info(f"  Accuracy: {type_results['accuracy']:.4f}")
     logger.info(f"  Precision: {type_results['precision']:.4f}")
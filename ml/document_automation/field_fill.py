@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Field Fill for Document Automation Module.
+
+This module holds the per-field work of filling a template: resolving a
+field's value from nested data and converting it for the field's type. Like
+field_walk, it has no heavy imports and is fully typed so it can be compiled
+with mypyc (see setup.py); the pure Python module is used when no compiled
+build is installed.
+"""
+
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+# Form field types grouped by how their values are converted
+TEXT_FIELD_TYPES: FrozenSet[str] = frozenset({"Text", "TextField"})
+CHECKBOX_FIELD_TYPES: FrozenSet[str] = frozenset({"CheckBox", "CheckButton"})
+CHOICE_FIELD_TYPES: FrozenSet[str] = frozenset({"Choice", "ListBox", "ComboBox"})
+
+# A lookup step: (name, list index), where the index is None for a plain key
+PathStep = Tuple[str, Optional[int]]
+
+# Parsed field paths; templates use a bounded set of paths, so entries are
+# only dropped when the cache grows unexpectedly large
+_MAX_COMPILED_PATHS = 4096
+_compiled_paths: Dict[str, Tuple[PathStep, ...]] = {}
+
+
+def compile_path(field_path: str) -> Tuple[PathStep, ...]:
+    """Parse a dot-separated field path into lookup steps.
+
+    Args:
+        field_path: Path to the field (e.g., "education[0].university")
+
+    Returns:
+        Steps of (name, index), with index None for steps without an index
+    """
+    steps = _compiled_paths.get(field_path)
+    if steps is not None:
+        return steps
+
+    parsed: List[PathStep] = []
+    for part in field_path.split("."):
+        bracket = part.find("[")
+        if bracket != -1 and "]" in part:
+            parsed.append((part[:bracket], int(part[bracket + 1:].split("]")[0])))
+        else:
+            parsed.append((part, None))
+
+    if len(_compiled_paths) >= _MAX_COMPILED_PATHS:
+        _compiled_paths.clear()
+    steps = tuple(parsed)
+    _compiled_paths[field_path] = steps
+    return steps
+
+
+def get_nested_value(data: Any, field_path: str) -> Any:
+    """Get a value from nested dictionaries using a dot-separated path.
+
+    Args:
+        data: Data dictionary
+        field_path: Path to the field (e.g., "personal_info.first_name")
+
+    Returns:
+        Value at the specified path, or None if not found
+    """
+    value = data
+
+    for name, index in compile_path(field_path):
+        if not isinstance(value, dict):
+            return None
+
+        value = value.get(name)
+
+        if index is not None:
+            if isinstance(value, list) and 0 <= index < len(value):
+                value = value[index]
+            else:
+                return None
+        elif value is None:
+            return None
+
+    return value
+
+
+def convert_field_value(field_type: str, value: Any, options: List[str]) -> Any:
+    """Convert a data value for a form field of the given type.
+
+    Args:
+        field_type: Type of the form field
+        value: Value from the data (not None)
+        options: Allowed values for choice fields
+
+    Returns:
+        Value to set on the field, or None if a choice value is not one of
+        the field's options
+    """
+    if field_type in TEXT_FIELD_TYPES:
+        return str(value)
+
+    if field_type in CHECKBOX_FIELD_TYPES:
+        return bool(value)
+
+    if field_type in CHOICE_FIELD_TYPES and str(value) not in options:
+        return None
+
+    return value
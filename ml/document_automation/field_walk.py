@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Field Walk for Document Automation Module.
+
+This module holds the traversal that collects form fields and their values
+from nested synthetic documents. It is kept free of heavy imports and fully
+typed so it can be compiled with mypyc (see setup.py); the pure Python
+module is used when no compiled build is installed.
+"""
+
+from typing import Any, Dict, FrozenSet, List, Tuple
+
+
+def extract_fields(
+    obj: Any,
+    field_values: Dict[str, Dict[Any, None]],
+    skip_keys: FrozenSet[str]
+) -> None:
+    """Extract fields from a nested object.
+
+    Walks the object with an explicit stack, visiting fields in the same
+    order as a recursive depth-first traversal. Only values stored under
+    a dict key are fields; scalars directly inside lists are skipped.
+
+    Args:
+        obj: Object to extract fields from
+        field_values: Field name -> ordered set of values, updated in place
+        skip_keys: Dict keys that are not form fields
+    """
+    # (object, field name, whether the object is a dict value)
+    stack: List[Tuple[Any, str, bool]] = [(obj, "", False)]
+
+    while stack:
+        obj, field_name, is_field = stack.pop()
+
+        # Parsed JSON only holds exact built-in types, so dispatch on type()
+        # identity rather than the slower isinstance checks
+        if type(obj) is dict:
+            # Push in reverse so keys are visited in their original order
+            for key, value in reversed(obj.items()):
+                # Skip special keys
+                if key in skip_keys:
+                    continue
+                stack.append((value, f"{field_name}.{key}" if field_name else key, True))
+
+        elif type(obj) is list:
+            for i in range(len(obj) - 1, -1, -1):
+                stack.append((obj[i], f"{field_name}[{i}]", False))
+
+        elif is_field:
+            values = field_values.setdefault(field_name, {})
+            if obj is not None:
+                values[obj] = None
@@ -8,17 +8,28 @@ O-1 visa application forms using the trained document filling model.
 
 import os
 import json
+import hashlib
 import logging
 import time
+from concurrent.futures import ProcessPoolExecutor
 import torch
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union, Tuple
 import argparse
 
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
 # Import local modules
-from .template_processor import DocumentTemplate, TemplateFiller
-from .model_architecture import load_model, DocumentFillingModel
+from .template_processor import (
+    DocumentTemplate, TemplateFiller, fill_template_file, init_fill_worker
+)
+from .model_architecture import (
+    create_model, load_model, quantize_model, save_model, DocumentFillingModel
+)
 from .training_pipeline import Tokenizer
 
 # Configure logging
@@ -33,6 +44,66 @@ ROOT_DIR = Path(__file__).resolve().parent.parent.parent
 MODEL_DIR = ROOT_DIR / "data" / "models"
 TEMPLATE_DIR = ROOT_DIR / "data" / "templates"
 OUTPUT_DIR = ROOT_DIR / "data" / "output"
+PREDICTION_CACHE_FILENAME = "pred_cache.json"
+
+# ONNX Runtime execution providers in order of preference
+GPU_EXECUTION_PROVIDERS = ["TensorrtExecutionProvider", "CUDAExecutionProvider"]
+CPU_EXECUTION_PROVIDERS = ["OpenVINOExecutionProvider", "CPUExecutionProvider"]
+
+# Encoded field names are trimmed to the shortest of these lengths that fits
+SEQUENCE_LENGTH_BUCKETS = (16, 32, 64, 128)
+
+
+# Smallest batch of forms worth spreading over worker processes
+PARALLEL_FILL_THRESHOLD = 32
+
+
+def _bucket_length(length: int, max_length: int) -> int:
+    """Get the sequence length bucket for encoded names of the given length."""
+    for bucket in SEQUENCE_LENGTH_BUCKETS:
+        if length <= bucket < max_length:
+            return bucket
+    return max_length
+
+
+class OnnxDocumentFillingModel:
+    """Runs an exported document filling model with ONNX Runtime.
+    
+    Mirrors the inference call of DocumentFillingModel: it takes a tensor of
+    tokenized field names and returns value and field type logits, so the
+    interface can use it in place of the PyTorch model.
+    """
+    
+    def __init__(self, path: Union[str, Path], device: str = "cpu"):
+        """Create an inference session for an exported model.
+        
+        Args:
+            path: Path to the ONNX model
+            device: Device to prefer for inference (cuda or cpu)
+        """
+        if onnxruntime is None:
+            raise ImportError("onnxruntime is required to run ONNX models")
+        
+        preferred = CPU_EXECUTION_PROVIDERS
+        if torch.device(device).type == "cuda":
+            preferred = GPU_EXECUTION_PROVIDERS + CPU_EXECUTION_PROVIDERS
+        
+        available = set(onnxruntime.get_available_providers())
+        providers = [provider for provider in preferred if provider in available]
+        
+        self.session = onnxruntime.InferenceSession(str(path), providers=providers)
+        logger.info(f"ONNX model loaded from {path} with {self.session.get_providers()}")
+    
+    def eval(self) -> "OnnxDocumentFillingModel":
+        """Match nn.Module.eval; an exported model is always in eval mode."""
+        return self
+    
+    def __call__(self, field_names: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Predict value and field type logits for encoded field names."""
+        value_logits, type_logits = self.session.run(
+            None, {"field_names": field_names.cpu().numpy()}
+        )
+        return torch.from_numpy(value_logits), torch.from_numpy(type_logits)
 
 
 class FormFillingInterface:
@@ -44,7 +115,10 @@ class FormFillingInterface:
         vocab_path: Optional[Union[str, Path]] = None,
         template_dir: Optional[Union[str, Path]] = None,
         output_dir: Optional[Union[str, Path]] = None,
-        device: str = "cuda" if torch.cuda.is_available() else "cpu"
+        device: str = "cuda" if torch.cuda.is_available() else "cpu",
+        quantize: bool = False,
+        quantized_model_path: Optional[Union[str, Path]] = None,
+        use_prediction_cache: bool = False
     ):
         """Initialize the form filling interface.
         
@@ -54,6 +128,14 @@ class FormFillingInterface:
             template_dir: Directory containing form templates
             output_dir: Directory to save filled forms
             device: Device to use for inference (cuda or cpu)
+            quantize: Whether to use an INT8 quantized model on CPU (predicted
+                values may differ slightly from the floating point model)
+            quantized_model_path: Optional path where the quantized weights
+                are saved and reused while newer than the model weights
+            use_prediction_cache: Whether to reuse predictions saved for
+                field names by earlier runs of the same model. New
+                predictions are written by save_prediction_cache(), or on
+                leaving a ``with`` block over the interface
         """
         # Set directories
         self.model_path = Path(model_path) if model_path else MODEL_DIR / "best_model.pt"
@@ -61,6 +143,10 @@ class FormFillingInterface:
         self.template_dir = Path(template_dir) if template_dir else TEMPLATE_DIR
         self.output_dir = Path(output_dir) if output_dir else OUTPUT_DIR
         self.device = device
+        self.quantize = quantize
+        self.quantized_model_path = Path(quantized_model_path) if quantized_model_path else None
+        self.use_prediction_cache = use_prediction_cache
+        self.prediction_cache_file = self.output_dir / PREDICTION_CACHE_FILENAME
         
         # Create output directory
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -70,6 +156,16 @@ class FormFillingInterface:
         
         # Load available templates
         self._load_templates()
+        
+        # Field name -> predicted value, saved by save_prediction_cache()
+        self._prediction_cache = {}
+        self._prediction_cache_dirty = False
+        if self.use_prediction_cache:
+            self._load_prediction_cache()
+        
+        # Prepare the GPU for the batch shapes used by the templates
+        if torch.device(self.device).type == "cuda":
+            self._warm_up()
     
     def _load_model_and_tokenizer(self):
         """Load the document filling model and tokenizer."""
@@ -78,32 +174,202 @@ class FormFillingInterface:
             raise FileNotFoundError(f"Vocabulary file not found: {self.vocab_path}")
         
         self.tokenizer = Tokenizer(vocab_file=self.vocab_path)
+        self.compiled = False
+        
+        # Token index -> token for decoding whole batches at once; special
+        # tokens map to None so they can be filtered out
+        reverse_vocab = self.tokenizer.reverse_vocab
+        self._id_to_token = np.full(
+            max(len(self.tokenizer.vocab), max(reverse_vocab) + 1), "<unk>", dtype=object
+        )
+        for idx, token in reverse_vocab.items():
+            self._id_to_token[idx] = token
+        for token in ("<pad>", "<start>", "<end>"):
+            self._id_to_token[self.tokenizer.vocab[token]] = None
+        
+        # (batch size, sequence length) -> (CUDA graph, static input, static outputs)
+        self._cuda_graphs = {}
+        
+        # Pinned host buffer reused to stage encoded field names for the GPU,
+        # and an event marking when its last copy finished
+        self._pinned_buffer = None
+        self._pinned_copy_done = None
         
         # Load model
         if not self.model_path.exists():
             raise FileNotFoundError(f"Model weights not found: {self.model_path}")
         
-        self.model = load_model(
-            path=self.model_path,
-            vocab_size=len(self.tokenizer.vocab),
-            embedding_dim=256,
-            hidden_dim=512,
-            encoder_layers=4,
-            decoder_layers=4,
-            num_heads=8,
-            max_seq_length=128,
-            dropout=0.1
-        )
+        # Exported models run on ONNX Runtime (TensorRT or OpenVINO when
+        # available) instead of eager PyTorch
+        if self.model_path.suffix == ".onnx":
+            self.model = OnnxDocumentFillingModel(self.model_path, device=self.device)
+            logger.info(f"Model and tokenizer loaded successfully")
+            return
+        
+        model_config = {
+            "vocab_size": len(self.tokenizer.vocab),
+            "embedding_dim": 256,
+            "hidden_dim": 512,
+            "encoder_layers": 4,
+            "decoder_layers": 4,
+            "num_heads": 8,
+            "max_seq_length": 128,
+            "dropout": 0.1
+        }
+        
+        # On CPU, optionally use INT8 dynamically quantized linear layers. If
+        # a path is given, the quantized weights are saved there and reused
+        # while up to date
+        use_quantized = self.quantize and torch.device(self.device).type == "cpu"
+        quantized_path = self.quantized_model_path
+        
+        self.model = None
+        if (
+            use_quantized
+            and quantized_path is not None
+            and quantized_path.exists()
+            and quantized_path.stat().st_mtime >= self.model_path.stat().st_mtime
+        ):
+            self.model = create_model(**model_config)
+            self.model.fuse_field_name_projection()
+            self.model = quantize_model(self.model)
+            try:
+                self.model.load_state_dict(torch.load(quantized_path))
+                logger.info(f"Quantized model loaded from {quantized_path}")
+            except RuntimeError as e:
+                # Saved by an older version of the model architecture
+                logger.warning(f"Could not load quantized model, requantizing: {str(e)}")
+                self.model = None
+        
+        if self.model is None:
+            self.model = load_model(path=self.model_path, **model_config)
+            
+            # Fold the field name projection before quantizing, while the
+            # weights are still floating point
+            self.model.fuse_field_name_projection()
+            
+            if use_quantized:
+                self.model = quantize_model(self.model)
+                if quantized_path is not None:
+                    try:
+                        save_model(self.model, quantized_path)
+                    except OSError as e:
+                        logger.warning(f"Could not save quantized model: {str(e)}")
         
         self.model.to(self.device)
         self.model.eval()
         
+        # The interface only runs inference, so freeze the weights
+        self.model.requires_grad_(False)
+        
+        # On GPUs, compile the model (torch.compile needs torch 2.0); the
+        # compilation itself happens in _warm_up. Allow one compiled variant
+        # per batch size and sequence length bucket
+        if torch.device(self.device).type == "cuda" and hasattr(torch, "compile"):
+            torch._dynamo.config.cache_size_limit = max(torch._dynamo.config.cache_size_limit, 64)
+            self.model = torch.compile(
+                self.model, mode="reduce-overhead", fullgraph=True, dynamic=False
+            )
+            self.compiled = True
+        
         logger.info(f"Model and tokenizer loaded successfully")
     
+    def _model_fingerprint(self) -> str:
+        """Fingerprint the model, vocabulary and inference settings.
+        
+        Returns:
+            Hex digest identifying the predictions the model would make
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for path in (self.model_path, self.vocab_path):
+            stat = os.stat(path)
+            digest.update(f"{path.resolve()}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+        digest.update(repr((torch.device(self.device).type, self.quantize)).encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _load_prediction_cache(self):
+        """Load the saved predictions if they were made by the current model."""
+        self._prediction_cache_fingerprint = self._model_fingerprint()
+        
+        if not self.prediction_cache_file.exists():
+            return
+        
+        try:
+            with open(self.prediction_cache_file, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read prediction cache: {str(e)}")
+            return
+        
+        if cache.get("fingerprint") == self._prediction_cache_fingerprint:
+            self._prediction_cache = cache.get("predictions", {})
+            logger.info(f"Loaded {len(self._prediction_cache)} cached predictions")
+    
+    def __enter__(self) -> "FormFillingInterface":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.save_prediction_cache()
+    
+    def save_prediction_cache(self):
+        """Write new predictions to the cache file, if the cache is enabled."""
+        if not self.use_prediction_cache or not self._prediction_cache_dirty:
+            return
+        
+        cache = {
+            "fingerprint": self._prediction_cache_fingerprint,
+            "predictions": self._prediction_cache
+        }
+        
+        # Write to a temporary file and move it into place
+        tmp_file = self.prediction_cache_file.with_name(self.prediction_cache_file.name + ".tmp")
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(tmp_file, self.prediction_cache_file)
+        except OSError as e:
+            logger.warning(f"Could not save prediction cache: {str(e)}")
+            return
+        
+        self._prediction_cache_dirty = False
+    
+    def precompute_template_predictions(self, max_batch: int = 256):
+        """Predict and cache the values of every template field.
+        
+        Predictions depend only on the field name, so after this call
+        filling a template form is a cache lookup. Field names that are
+        already cached are skipped. Requires use_prediction_cache.
+        
+        Args:
+            max_batch: Maximum number of field names per model call
+        """
+        if not self.use_prediction_cache:
+            logger.warning("Prediction cache is disabled, nothing to precompute")
+            return
+        
+        uncached_names = list(dict.fromkeys(
+            field.name
+            for template in self.templates.values()
+            for field in template.fields
+            if field.name not in self._prediction_cache
+        ))
+        
+        if not uncached_names:
+            return
+        
+        logger.info(f"Precomputing predictions for {len(uncached_names)} template fields")
+        for start in range(0, len(uncached_names), max_batch):
+            self.predict_field_values(uncached_names[start:start + max_batch])
+        
+        self.save_prediction_cache()
+    
     def _load_templates(self):
         """Load available form templates."""
         self.templates = {}
         
+        # Template name -> encoded field names, in template field order
+        self.template_encoded = {}
+        
         # Find PDF files in template directory
         pdf_files = list(self.template_dir.glob("*.pdf"))
         
@@ -125,6 +391,11 @@ class FormFillingInterface:
                     template = DocumentTemplate(pdf_file)
                 
                 self.templates[template_name] = template
+                
+                # Template fields never change, so encode their names once
+                self.template_encoded[template_name] = self.encode_field_names(
+                    [field.name for field in template.fields]
+                )
                 logger.info(f"Loaded template: {template_name} with {len(template.fields)} fields")
             
             except Exception as e:
@@ -132,6 +403,89 @@ class FormFillingInterface:
         
         logger.info(f"Loaded {len(self.templates)} templates")
     
+    def _warm_up(self, max_length: int = 128):
+        """Run warm-up predictions for a single field and a full template.
+        
+        Every sequence length bucket is warmed up for each batch size.
+        Warm-up goes through predict_encoded, so it compiles the same
+        variants real calls use: under inference_mode and autocast, with
+        batches padded to a power of two.
+        
+        Compiles the model for these batch shapes and grows the CUDA caching
+        allocator to the largest one, so its blocks are reused by later
+        calls instead of being allocated while filling forms. With
+        torch.compile, the CUDA graphs it captures are recorded here too;
+        without it, CUDA graphs are captured directly.
+        
+        Args:
+            max_length: Length of the encoded field names
+        """
+        batch_sizes = {1}
+        batch_sizes.update(len(template.fields) for template in self.templates.values())
+        batch_sizes.discard(0)
+        
+        if not isinstance(self.model, torch.nn.Module):
+            sequence_lengths = [max_length]
+        else:
+            sequence_lengths = sorted({_bucket_length(bucket, max_length) for bucket in SEQUENCE_LENGTH_BUCKETS})
+        
+        # Without torch.compile (torch < 2.0), capture CUDA graphs by hand for
+        # every power of two batch size up to the largest template
+        if not self.compiled and isinstance(self.model, torch.nn.Module):
+            largest = 1 << (max(batch_sizes) - 1).bit_length()
+            for batch_size in (1 << i for i in range(largest.bit_length())):
+                for sequence_length in sequence_lengths:
+                    self._capture_cuda_graph(batch_size, sequence_length)
+            
+            logger.info(f"Captured CUDA graphs for batch sizes up to {largest}")
+            return
+        
+        # predict_encoded pads compiled batches to a power of two
+        if self.compiled:
+            batch_sizes = {1 << (batch_size - 1).bit_length() for batch_size in batch_sizes}
+        
+        # Names without padding keep their full length when predict_encoded
+        # trims the batch, so each input lands in its own length bucket
+        unk_index = self.tokenizer.vocab["<unk>"]
+        for batch_size in sorted(batch_sizes, reverse=True):
+            for sequence_length in sequence_lengths:
+                self.predict_encoded(torch.full(
+                    (batch_size, sequence_length),
+                    unk_index,
+                    dtype=torch.long,
+                    device=self.device
+                ))
+        
+        logger.info(f"Warmed up inference for batch sizes {sorted(batch_sizes)}")
+    
+    def _capture_cuda_graph(self, batch_size: int, max_length: int):
+        """Capture the model's forward pass for one input shape as a CUDA graph.
+        
+        Args:
+            batch_size: Number of field names in the captured batch
+            max_length: Length of the encoded field names
+        """
+        static_input = self.encode_field_names([""] * batch_size, max_length=max_length)
+        
+        # Warm up on a side stream before capturing, as CUDA graphs require
+        stream = torch.cuda.Stream()
+        stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(stream), torch.inference_mode(), torch.autocast(
+            device_type="cuda", dtype=torch.float16
+        ):
+            for _ in range(3):
+                self._run_model(static_input)
+        torch.cuda.current_stream().wait_stream(stream)
+        
+        # Autocast's weight cache cannot be used inside a captured graph
+        graph = torch.cuda.CUDAGraph()
+        with torch.inference_mode(), torch.autocast(
+            device_type="cuda", dtype=torch.float16, cache_enabled=False
+        ), torch.cuda.graph(graph):
+            static_outputs = self._run_model(static_input)
+        
+        self._cuda_graphs[(batch_size, max_length)] = (graph, static_input, static_outputs)
+    
     def list_templates(self) -> List[str]:
         """List available templates.
         
@@ -158,7 +512,8 @@ class FormFillingInterface:
         self,
         field_names: List[str],
         context: Optional[Dict[str, Any]] = None,
-        max_length: int = 128
+        max_length: int = 128,
+        precomputed_tensor: Optional[torch.Tensor] = None
     ) -> Dict[str, str]:
         """Predict values for a list of field names.
         
@@ -166,31 +521,170 @@ class FormFillingInterface:
             field_names: List of field names
             context: Optional context information to aid prediction
             max_length: Maximum sequence length for generated values
+            precomputed_tensor: Field names already encoded by
+                encode_field_names, in the same order (encoded here if None)
             
         Returns:
             Dictionary mapping field names to predicted values
         """
-        # Encode field names
-        encoded_names = [self.tokenizer.encode(name, max_length=max_length) for name in field_names]
+        # Predictions depend only on the field name, so only the first
+        # occurrence of each name without a cached prediction goes through
+        # the model
+        cache = self._prediction_cache
+        first_indices = {}
+        for i, name in enumerate(field_names):
+            if name not in cache:
+                first_indices.setdefault(name, i)
+        uncached_indices = list(first_indices.values())
+        
+        if uncached_indices:
+            uncached_names = list(first_indices)
+            
+            if precomputed_tensor is None:
+                field_name_tensor = self.encode_field_names(uncached_names, max_length=max_length)
+            elif len(uncached_indices) < len(field_names):
+                field_name_tensor = precomputed_tensor[uncached_indices]
+            else:
+                field_name_tensor = precomputed_tensor
+            
+            predicted_values, _ = self.predict_encoded(field_name_tensor)
+            new_predictions = dict(zip(uncached_names, predicted_values))
+            
+            if not self.use_prediction_cache:
+                return {name: new_predictions[name] for name in field_names}
+            
+            cache.update(new_predictions)
+            self._prediction_cache_dirty = True
         
-        # Convert to tensor
-        field_name_tensor = torch.tensor(encoded_names, dtype=torch.long).to(self.device)
+        # Create mapping from field names to predicted values
+        return {name: cache[name] for name in field_names}
+    
+    def encode_field_names(self, field_names: List[str], max_length: int = 128) -> torch.Tensor:
+        """Encode field names into one padded tensor on the model's device.
         
-        # Generate predictions
-        with torch.no_grad():
+        Args:
+            field_names: List of field names
+            max_length: Maximum sequence length
+            
+        Returns:
+            Tensor of token indices with shape (len(field_names), max_length)
+        """
+        use_cuda = torch.device(self.device).type == "cuda"
+        n_elements = len(field_names) * max_length
+        
+        if use_cuda:
+            # Stage in the reused pinned buffer (growing it when needed), once
+            # its previous copy to the GPU has finished
+            if self._pinned_copy_done is not None:
+                self._pinned_copy_done.synchronize()
+            if self._pinned_buffer is None or len(self._pinned_buffer) < n_elements:
+                self._pinned_buffer = torch.empty(n_elements, dtype=torch.long, pin_memory=True)
+            field_name_tensor = self._pinned_buffer[:n_elements].view(len(field_names), max_length)
+        else:
+            field_name_tensor = torch.empty((len(field_names), max_length), dtype=torch.long)
+        
+        # Fill the array in place rather than building nested lists
+        encoded_names = field_name_tensor.numpy()
+        encoded_names.fill(self.tokenizer.vocab["<pad>"])
+        for i, name in enumerate(field_names):
+            indices = self.tokenizer.encode(name, max_length=max_length)
+            encoded_names[i, :len(indices)] = indices
+        
+        if not use_cuda:
+            return field_name_tensor.to(self.device)
+        
+        # Copy to the GPU asynchronously from pinned memory
+        field_name_tensor = field_name_tensor.to(self.device, non_blocking=True)
+        self._pinned_copy_done = torch.cuda.Event()
+        self._pinned_copy_done.record()
+        return field_name_tensor
+    
+    def _run_model(self, field_name_tensor: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Run the model on encoded field names, masking their padding.
+        
+        Returns:
+            Tuple of (predicted token indices, field type logits)
+        """
+        if not isinstance(self.model, torch.nn.Module):
             value_logits, type_logits = self.model(field_name_tensor)
+            return torch.argmax(value_logits, dim=-1), type_logits
+        
+        # Take the argmax inside the model, without the full value logits
+        return self.model(
+            field_name_tensor,
+            field_name_mask=field_name_tensor == self.tokenizer.vocab["<pad>"],
+            argmax_values=True
+        )
+    
+    def predict_encoded(self, field_name_tensor: torch.Tensor) -> Tuple[List[str], torch.Tensor]:
+        """Predict values for already encoded field names.
+        
+        Args:
+            field_name_tensor: Encoded field names on the model's device
             
-            # Get predicted values
-            predicted_indices = torch.argmax(value_logits, dim=-1).cpu().numpy()
+        Returns:
+            Tuple of (predicted values in input order, field type logits)
+        """
+        n_names = len(field_name_tensor)
+        
+        # Names are padded at the end, so drop the padding columns shared by
+        # the whole batch, rounding the length up to a bucket. Exported ONNX
+        # models keep the full length they were exported with
+        if n_names and isinstance(self.model, torch.nn.Module):
+            longest = int((field_name_tensor != self.tokenizer.vocab["<pad>"]).sum(dim=1).max())
+            field_name_tensor = field_name_tensor[:, :_bucket_length(longest, field_name_tensor.shape[1])]
+        
+        # The compiled model and captured CUDA graphs are specialized per input
+        # shape, so pad the batch to a power of two with copies of the first
+        # row to keep the number of shapes small
+        if n_names and (self.compiled or self._cuda_graphs):
+            padded_size = 1 << (n_names - 1).bit_length()
+            if padded_size > n_names:
+                field_name_tensor = torch.cat([
+                    field_name_tensor,
+                    field_name_tensor[:1].expand(padded_size - n_names, -1)
+                ])
+        
+        # Run the forward pass in float16 on GPUs; autocast is a no-op on CPU
+        use_autocast = torch.device(self.device).type == "cuda"
+        
+        # Generate predictions. inference_mode also skips the view and
+        # version counter tracking that no_grad keeps
+        with torch.inference_mode(), torch.autocast(
+            device_type="cuda", dtype=torch.float16, enabled=use_autocast
+        ):
+            cuda_graph = self._cuda_graphs.get(tuple(field_name_tensor.shape))
             
-            # Decode predictions
+            if cuda_graph is not None:
+                # Replay the captured graph on a copy of the input, and copy
+                # the outputs before the next replay overwrites them
+                graph, static_input, (static_indices, static_type_logits) = cuda_graph
+                static_input.copy_(field_name_tensor)
+                graph.replay()
+                predicted_indices = static_indices[:n_names]
+                type_logits = static_type_logits[:n_names].clone()
+            else:
+                # With mode="reduce-overhead" the compiled model replays CUDA
+                # graphs whose outputs the next call overwrites, so start a
+                # new step and copy the outputs that are returned
+                if self.compiled and hasattr(getattr(torch, "compiler", None), "cudagraph_mark_step_begin"):
+                    torch.compiler.cudagraph_mark_step_begin()
+                predicted_indices, type_logits = self._run_model(field_name_tensor)
+                predicted_indices, type_logits = predicted_indices[:n_names], type_logits[:n_names]
+                if self.compiled:
+                    type_logits = type_logits.clone()
+            
+            # Only the token indices are copied back
+            predicted_indices = predicted_indices.to(torch.int32).cpu().numpy()
+            
+            # Decode predictions, looking up every token in one indexing pass
+            # (the same result as Tokenizer.decode)
             predicted_values = [
-                self.tokenizer.decode(indices)
-                for indices in predicted_indices
+                " ".join(filter(None, tokens))
+                for tokens in self._id_to_token[predicted_indices]
             ]
         
-        # Create mapping from field names to predicted values
-        return {name: value for name, value in zip(field_names, predicted_values)}
+        return predicted_values, type_logits
     
     def fill_form(
         self,
@@ -224,11 +718,15 @@ class FormFillingInterface:
         
         # Predict missing values if autopredict is enabled
         if autopredict:
-            missing_fields = [name for name in field_names if name not in field_values]
+            missing_indices = [i for i, name in enumerate(field_names) if name not in field_values]
+            missing_fields = [field_names[i] for i in missing_indices]
             
             if missing_fields:
                 logger.info(f"Predicting values for {len(missing_fields)} missing fields")
-                predicted_values = self.predict_field_values(missing_fields)
+                predicted_values = self.predict_field_values(
+                    missing_fields,
+                    precomputed_tensor=self.template_encoded[template_name][missing_indices]
+                )
                 
                 # Add predicted values to field_values
                 field_values.update(predicted_values)
@@ -256,15 +754,26 @@ class FormFillingInterface:
         template_name: str,
         batch_data: List[Dict[str, str]],
         output_dir: Optional[Union[str, Path]] = None,
-        autopredict: bool = True
+        autopredict: bool = True,
+        max_batch: Optional[int] = None,
+        max_workers: Optional[int] = None
     ) -> List[Path]:
         """Fill a form template with multiple sets of values (batch mode).
         
+        Missing fields are predicted for the whole batch at once rather than
+        form by form. The PDFs are written in this process unless
+        ``max_workers`` asks for worker processes.
+        
         Args:
             template_name: Name of the template to fill
             batch_data: List of dictionaries mapping field names to values
             output_dir: Directory to save filled forms
             autopredict: Whether to predict values for fields not provided
+            max_batch: Maximum number of field names per model call
+                (all missing fields in one call if None)
+            max_workers: Number of worker processes writing PDFs. Only used
+                for batches of at least PARALLEL_FILL_THRESHOLD forms, where
+                the pool start-up is paid back (None writes in this process)
             
         Returns:
             List of paths to filled forms
@@ -281,20 +790,66 @@ class FormFillingInterface:
         
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Fill forms
-        filled_paths = []
-        
-        for i, field_values in enumerate(batch_data):
-            output_file = output_dir / f"{template_name}_{i+1}.pdf"
+        if autopredict:
+            field_names = [field.name for field in self.templates[template_name].fields]
             
-            filled_path = self.fill_form(
-                template_name=template_name,
-                field_values=field_values,
-                output_file=output_file,
-                autopredict=autopredict
-            )
+            # Missing field indices of each form, and the distinct ones across
+            # the batch. Predictions depend only on the field name, so each
+            # missing field is predicted once for all forms
+            missing_indices_per_form = [
+                [i for i, name in enumerate(field_names) if name not in field_values]
+                for field_values in batch_data
+            ]
+            all_missing_indices = sorted(set().union(*missing_indices_per_form))
+            
+            predicted_values = {}
+            if all_missing_indices:
+                logger.info(f"Predicting values for {len(all_missing_indices)} missing fields")
+                
+                chunk_size = max_batch or len(all_missing_indices)
+                encoded_names = self.template_encoded[template_name]
+                
+                for start in range(0, len(all_missing_indices), chunk_size):
+                    chunk = all_missing_indices[start:start + chunk_size]
+                    predicted_values.update(self.predict_field_values(
+                        [field_names[i] for i in chunk],
+                        precomputed_tensor=encoded_names[chunk]
+                    ))
+            
+            # Add predicted values to each form's field values
+            for field_values, missing_indices in zip(batch_data, missing_indices_per_form):
+                field_values.update(
+                    (field_names[i], predicted_values[field_names[i]]) for i in missing_indices
+                )
+        
+        # Fill forms
+        output_files = [output_dir / f"{template_name}_{i+1}.pdf" for i in range(len(batch_data))]
+        workers = min(max_workers or 1, len(batch_data))
+        if len(batch_data) < PARALLEL_FILL_THRESHOLD:
+            workers = 1
+        
+        if workers <= 1:
+            filled_paths = [
+                self.fill_form(
+                    template_name=template_name,
+                    field_values=field_values,
+                    output_file=output_file,
+                    autopredict=False
+                )
+                for field_values, output_file in zip(batch_data, output_files)
+            ]
+        else:
+            # PDF writing is CPU bound, so spread it over worker processes that
+            # each set up the template once; prediction stays in this process.
+            # The workers only import the template processor, not the model.
+            template = self.templates[template_name]
             
-            filled_paths.append(filled_path)
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=init_fill_worker,
+                initargs=(template.template_file, template.fields)
+            ) as executor:
+                filled_paths = list(executor.map(fill_template_file, batch_data, output_files))
         
         logger.info(f"Filled {len(filled_paths)} forms in batch mode")
         
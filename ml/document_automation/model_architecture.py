@@ -8,7 +8,9 @@ for the document filling model that automates O-1 visa applications.
 
 import os
 import json
+import inspect
 import logging
+import pickle
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
@@ -94,17 +96,19 @@ class FieldEncoder(nn.Module):
         
         self.dropout = nn.Dropout(dropout)
     
-    def forward(self, x, mask=None):
+    def forward(self, x, mask=None, projected: bool = False):
         """Forward pass through the field encoder.
         
         Args:
             x: Input tensor of embedded token sequences
             mask: Optional attention mask
+            projected: Whether x has already been through input_projection
             
         Returns:
             Encoded field representations
         """
-        x = self.input_projection(x)
+        if not projected:
+            x = self.input_projection(x)
         x = self.dropout(x)
         return self.transformer_encoder(x, src_key_padding_mask=mask)
 
@@ -187,15 +191,27 @@ class FieldValuePredictor(nn.Module):
         super().__init__()
         
         self.max_seq_length = max_seq_length
+        self.vocab_size = vocab_size
         
-        # Predict the next token in sequence
-        self.output_projection = nn.Linear(hidden_dim, vocab_size)
-        
-        # For classification of field types (text, number, date, checkbox, etc.)
-        self.field_type_classifier = nn.Linear(hidden_dim, 8)  # 8 common field types
+        # One projection computes both the next token logits and the field
+        # type classification (text, number, date, checkbox, etc.) logits
+        # for 8 common field types; forward splits the output
+        self.fused_projection = nn.Linear(hidden_dim, vocab_size + 8)
         
         self.dropout = nn.Dropout(dropout)
     
+    def _load_from_state_dict(self, state_dict, prefix, *args, **kwargs):
+        """Load weights, migrating checkpoints saved with separate projections."""
+        for name in ("weight", "bias"):
+            output_key = f"{prefix}output_projection.{name}"
+            classifier_key = f"{prefix}field_type_classifier.{name}"
+            if output_key in state_dict and classifier_key in state_dict:
+                state_dict[f"{prefix}fused_projection.{name}"] = torch.cat(
+                    [state_dict.pop(output_key), state_dict.pop(classifier_key)]
+                )
+        
+        super()._load_from_state_dict(state_dict, prefix, *args, **kwargs)
+    
     def forward(self, x):
         """Forward pass through the field value predictor.
         
@@ -205,8 +221,49 @@ class FieldValuePredictor(nn.Module):
         Returns:
             Token prediction logits and field type classification logits
         """
+        x = self.fused_projection(self.dropout(x))
+        return x[..., :self.vocab_size], x[..., self.vocab_size:]
+    
+    def predict_argmax(self, x, chunk_size: int = 8192):
+        """Predict the most likely token without materializing all logits.
+        
+        Projects onto the vocabulary in chunks, keeping a running maximum
+        per position, so only one chunk of logits exists at a time.
+        
+        Args:
+            x: Input tensor of contextualized field representations
+            chunk_size: Number of vocabulary entries projected at once
+            
+        Returns:
+            Predicted token indices and field type classification logits
+        """
         x = self.dropout(x)
-        return self.output_projection(x), self.field_type_classifier(x)
+        
+        # Quantized layers only expose their packed weights through
+        # forward, so project in one go
+        if not isinstance(self.fused_projection, nn.Linear):
+            x = self.fused_projection(x)
+            return torch.argmax(x[..., :self.vocab_size], dim=-1), x[..., self.vocab_size:]
+        
+        weight = self.fused_projection.weight
+        bias = self.fused_projection.bias
+        best_values = best_indices = None
+        
+        for start in range(0, self.vocab_size, chunk_size):
+            end = min(start + chunk_size, self.vocab_size)
+            values, indices = F.linear(x, weight[start:end], bias[start:end]).max(dim=-1)
+            indices = indices + start
+            
+            if best_values is None:
+                best_values, best_indices = values, indices
+            else:
+                # Strictly greater keeps the first maximum, like argmax
+                better = values > best_values
+                best_values = torch.where(better, values, best_values)
+                best_indices = torch.where(better, indices, best_indices)
+        
+        type_logits = F.linear(x, weight[self.vocab_size:], bias[self.vocab_size:])
+        return best_indices, type_logits
 
 
 class DocumentFillingModel(nn.Module):
@@ -265,6 +322,22 @@ class DocumentFillingModel(nn.Module):
             max_seq_length=max_seq_length,
             dropout=dropout
         )
+        
+        # Field name embedding with the encoder's input projection folded in,
+        # set by fuse_field_name_projection for inference
+        self.field_name_embedding = None
+    
+    def fuse_field_name_projection(self):
+        """Fold the field encoder's input projection into the embedding.
+        
+        Both are linear, so embedding a token and projecting it equals
+        looking up a precomputed row of embedding @ W.T + b. The result is
+        used in evaluation mode only; training keeps the separate layers.
+        """
+        projection = self.field_encoder.input_projection
+        with torch.no_grad():
+            folded = F.linear(self.embedding_layer.embedding.weight, projection.weight, projection.bias)
+        self.field_name_embedding = nn.Embedding.from_pretrained(folded, freeze=True)
     
     def forward(
         self,
@@ -272,7 +345,8 @@ class DocumentFillingModel(nn.Module):
         field_values=None,
         field_name_mask=None,
         field_value_mask=None,
-        target_field_idx=None
+        target_field_idx=None,
+        argmax_values: bool = False
     ):
         """Forward pass through the document filling model.
         
@@ -282,15 +356,20 @@ class DocumentFillingModel(nn.Module):
             field_name_mask: Optional mask for field names
             field_value_mask: Optional mask for field values
             target_field_idx: Index of the target field to predict
+            argmax_values: Whether to return predicted token indices instead
+                of value logits (for inference)
             
         Returns:
             Predicted field values and field types
         """
-        # Embed field names
-        embedded_field_names = self.embedding_layer(field_names)
-        
-        # Encode all fields
-        encoded_fields = self.field_encoder(embedded_field_names, mask=field_name_mask)
+        # Embed and encode all fields
+        if self.field_name_embedding is not None and not self.training:
+            encoded_fields = self.field_encoder(
+                self.field_name_embedding(field_names), mask=field_name_mask, projected=True
+            )
+        else:
+            embedded_field_names = self.embedding_layer(field_names)
+            encoded_fields = self.field_encoder(embedded_field_names, mask=field_name_mask)
         
         if field_values is not None:
             # For training mode with known field values
@@ -323,6 +402,8 @@ class DocumentFillingModel(nn.Module):
             contextualized_fields = embedded_start
         
         # Predict field values and types
+        if argmax_values:
+            return self.field_value_predictor.predict_argmax(contextualized_fields)
         return self.field_value_predictor(contextualized_fields)
 
 
@@ -377,6 +458,61 @@ def save_model(model: DocumentFillingModel, path: Union[str, Path]):
     logger.info(f"Model saved to {path}")
 
 
+def quantize_model(model: DocumentFillingModel) -> DocumentFillingModel:
+    """Quantize the model's linear layers to INT8 for CPU inference.
+    
+    Uses dynamic quantization: weights are stored as INT8 and activations
+    are quantized on the fly, so no calibration data is needed.
+    
+    Args:
+        model: The model to quantize
+        
+    Returns:
+        Quantized copy of the model in evaluation mode
+    """
+    model.eval()
+    return torch.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+
+def export_onnx(
+    model: DocumentFillingModel,
+    path: Union[str, Path],
+    max_seq_length: int = 128,
+    opset_version: int = 17
+):
+    """Export the model's inference pass to ONNX.
+    
+    The exported graph takes a batch of tokenized field names and returns
+    the value and field type logits; the batch size is dynamic.
+    
+    Args:
+        model: The model to export
+        path: Path to save the ONNX model to
+        max_seq_length: Length of the tokenized field names
+        opset_version: ONNX opset version to target
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    model.eval()
+    dummy_field_names = torch.ones((1, max_seq_length), dtype=torch.long)
+    
+    torch.onnx.export(
+        model,
+        (dummy_field_names,),
+        str(path),
+        input_names=["field_names"],
+        output_names=["value_logits", "type_logits"],
+        dynamic_axes={
+            "field_names": {0: "batch"},
+            "value_logits": {0: "batch"},
+            "type_logits": {0: "batch"}
+        },
+        opset_version=opset_version
+    )
+    logger.info(f"Model exported to {path}")
+
+
 def load_model(
     path: Union[str, Path],
     vocab_size: int,
@@ -409,7 +545,14 @@ def load_model(
     if not path.exists():
         raise FileNotFoundError(f"Model file not found: {path}")
     
-    model = create_model(
+    # Memory-map the checkpoint instead of reading it into memory
+    try:
+        state_dict = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    except (TypeError, RuntimeError, pickle.UnpicklingError):
+        # torch < 2.1, or a checkpoint in the legacy (non-zip) format
+        state_dict = torch.load(path, map_location="cpu")
+    
+    model_config = dict(
         vocab_size=vocab_size,
         embedding_dim=embedding_dim,
         hidden_dim=hidden_dim,
@@ -420,7 +563,16 @@ def load_model(
         dropout=dropout
     )
     
-    model.load_state_dict(torch.load(path))
+    if "assign" in inspect.signature(nn.Module.load_state_dict).parameters:
+        # Build the model on the meta device, without allocating or randomly
+        # initializing weights, and adopt the loaded tensors as its weights
+        with torch.device("meta"):
+            model = create_model(**model_config)
+        model.load_state_dict(state_dict, assign=True)
+    else:
+        model = create_model(**model_config)
+        model.load_state_dict(state_dict)
+    
     logger.info(f"Model loaded from {path}")
     
     return model
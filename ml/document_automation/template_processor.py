@@ -10,6 +10,7 @@ import os
 import json
 import logging
 import tempfile
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union, Tuple
 import fitz  # PyMuPDF
@@ -17,6 +18,13 @@ from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 import pandas as pd
 
+from .field_fill import convert_field_value, get_nested_value
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -28,9 +36,28 @@ logger = logging.getLogger(__name__)
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent
 TEMPLATE_DIR = ROOT_DIR / "data" / "templates"
 
+
+def _read_fields_file(fields_file: Path) -> List[Dict[str, Any]]:
+    """Read field definitions from a JSON file."""
+    raw = fields_file.read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _write_fields_file(fields_file: Path, fields_data: List[Dict[str, Any]]):
+    """Write field definitions to a JSON file as indented UTF-8."""
+    if orjson is not None:
+        # orjson always writes non-ASCII characters as UTF-8, like ensure_ascii=False
+        fields_file.write_bytes(orjson.dumps(fields_data, option=orjson.OPT_INDENT_2))
+    else:
+        fields_file.write_bytes(json.dumps(fields_data, indent=2, ensure_ascii=False).encode("utf-8"))
+
+
 class FormField:
     """Represents a field in a form template."""
     
+    # Large templates have hundreds of fields; slots keep each one compact
+    __slots__ = ("name", "field_type", "x", "y", "width", "height", "page", "options")
+    
     def __init__(
         self,
         name: str,
@@ -122,21 +149,44 @@ class DocumentTemplate:
         if not self.template_file.exists():
             raise FileNotFoundError(f"Template file not found: {self.template_file}")
         
-        # Initialize empty fields list
-        self.fields: List[FormField] = []
+        # Fields are loaded on first access
+        self._fields: Optional[List[FormField]] = None
         
-        # Load fields if fields file is provided
-        if self.fields_file and self.fields_file.exists():
-            self._load_fields()
-        else:
-            # Try to extract fields from the PDF (if it has form fields)
-            self._extract_fields()
+        # Field name -> field, built on the first lookup by name
+        self._name_index: Optional[Dict[str, FormField]] = None
+        
+        # Template PDF contents and form layout (whether it is a form, and
+        # which pages carry widgets), worked out on first open
+        self._template_bytes: Optional[bytes] = None
+        self._is_form: Optional[bool] = None
+        self._widget_pages: Optional[List[int]] = None
+    
+    @property
+    def fields(self) -> List[FormField]:
+        """Fields of the template, loaded on first access.
+        
+        Fields come from the fields file if provided, otherwise they are
+        extracted from the PDF (if it has form fields).
+        """
+        if self._fields is None:
+            self._fields = []
+            
+            if self.fields_file and self.fields_file.exists():
+                self._load_fields()
+            else:
+                self._extract_fields()
+        
+        return self._fields
+    
+    @fields.setter
+    def fields(self, fields: List[FormField]):
+        self._fields = fields
+        self._name_index = None
     
     def _load_fields(self):
         """Load fields from the fields JSON file."""
         try:
-            with open(self.fields_file, "r", encoding="utf-8") as f:
-                fields_data = json.load(f)
+            fields_data = _read_fields_file(self.fields_file)
             
             self.fields = [FormField.from_dict(field_data) for field_data in fields_data]
             logger.info(f"Loaded {len(self.fields)} fields from {self.fields_file}")
@@ -145,50 +195,94 @@ class DocumentTemplate:
             logger.error(f"Error loading fields from {self.fields_file}: {str(e)}")
             self.fields = []
     
+    def _open(self) -> fitz.Document:
+        """Open a copy of the template PDF, reading the file only once."""
+        if self._template_bytes is None:
+            self._template_bytes = self.template_file.read_bytes()
+        
+        return fitz.open(stream=self._template_bytes, filetype="pdf")
+    
+    def open_and_index(self) -> Tuple[fitz.Document, bool, Dict[str, fitz.Widget], List[fitz.Page]]:
+        """Open a copy of the template and index its form widgets by name.
+        
+        Returns:
+            Tuple of (document, whether it has form fields, field name -> first
+            widget with that name, pages holding the widgets). Widgets are only
+            bound while their page is referenced, so keep the pages for as
+            long as the widgets are used.
+        """
+        doc = self._open()
+        
+        if self._is_form is None:
+            self._is_form = bool(doc.is_form_pdf)
+        
+        widget_map = {}
+        pages = []
+        
+        if self._is_form:
+            # After the first open only the pages known to carry widgets are loaded
+            page_numbers = self._widget_pages
+            if page_numbers is None:
+                page_numbers = range(doc.page_count)
+            
+            widget_pages = []
+            for page_number in page_numbers:
+                page = doc[page_number]
+                has_widgets = False
+                for widget in page.widgets():
+                    widget_map.setdefault(widget.field_name, widget)
+                    has_widgets = True
+                
+                if has_widgets:
+                    pages.append(page)
+                    widget_pages.append(page_number)
+            
+            self._widget_pages = widget_pages
+        
+        return doc, self._is_form, widget_map, pages
+    
     def _extract_fields(self):
         """Extract fields from the PDF if it has form fields."""
         try:
-            doc = fitz.open(self.template_file)
+            doc = self._open()
             
             # Check if the PDF has form fields
-            if doc.is_form_pdf:
+            self._is_form = bool(doc.is_form_pdf)
+            if self._is_form:
                 logger.info(f"PDF has form fields: {self.template_file}")
                 
-                # Extract fields
-                for widget in doc.widgets():
-                    field_name = widget.field_name
-                    field_type = widget.field_type_string
-                    
-                    # Get field position
-                    rect = widget.rect
-                    page_width = doc[widget.page_number].rect.width
-                    page_height = doc[widget.page_number].rect.height
-                    
-                    # Normalize coordinates to 0.0-1.0
-                    x = rect.x0 / page_width
-                    y = rect.y0 / page_height
-                    width = (rect.x1 - rect.x0) / page_width
-                    height = (rect.y1 - rect.y0) / page_height
-                    
-                    # Get options for choice fields
-                    options = []
-                    if field_type in ["Choice", "ListBox"]:
-                        options = widget.choice_values
-                    
-                    # Create form field
-                    field = FormField(
-                        name=field_name,
-                        field_type=field_type,
-                        x=x,
-                        y=y,
-                        width=width,
-                        height=height,
-                        page=widget.page_number,
-                        options=options
-                    )
+                # Extract fields page by page, so each page's size is read
+                # once rather than per widget
+                append_field = self.fields.append
+                form_field = FormField
+                
+                for page_number, page in enumerate(doc):
+                    page_width = page.rect.width
+                    page_height = page.rect.height
                     
-                    self.fields.append(field)
+                    for widget in page.widgets():
+                        field_type = widget.field_type_string
+                        
+                        # Normalize coordinates to 0.0-1.0
+                        rect = widget.rect
+                        
+                        # Get options for choice fields
+                        options = []
+                        if field_type in ["Choice", "ListBox", "ComboBox"]:
+                            options = widget.choice_values or []
+                        
+                        append_field(form_field(
+                            name=widget.field_name,
+                            field_type=field_type,
+                            x=rect.x0 / page_width,
+                            y=rect.y0 / page_height,
+                            width=(rect.x1 - rect.x0) / page_width,
+                            height=(rect.y1 - rect.y0) / page_height,
+                            page=page_number,
+                            options=options
+                        ))
                 
+                self._widget_pages = sorted({field.page for field in self.fields})
                 logger.info(f"Extracted {len(self.fields)} fields from {self.template_file}")
             else:
                 logger.warning(f"PDF does not have form fields: {self.template_file}")
@@ -216,8 +310,7 @@ class DocumentTemplate:
         fields_data = [field.to_dict() for field in self.fields]
         
         # Save to file
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(fields_data, f, indent=2, ensure_ascii=False)
+        _write_fields_file(output_file, fields_data)
         
         logger.info(f"Saved {len(self.fields)} fields to {output_file}")
         
@@ -230,6 +323,20 @@ class DocumentTemplate:
             field: Field to add
         """
         self.fields.append(field)
+        
+        # Keep the name index in step; the first field with a name wins
+        if self._name_index is not None:
+            self._name_index.setdefault(field.name, field)
+    
+    def _get_name_index(self) -> Dict[str, FormField]:
+        """Get the field name index, building it if needed."""
+        if self._name_index is None:
+            name_index = {}
+            for field in self.fields:
+                name_index.setdefault(field.name, field)
+            self._name_index = name_index
+        
+        return self._name_index
     
     def get_field_by_name(self, name: str) -> Optional[FormField]:
         """Get a field by name.
@@ -240,19 +347,16 @@ class DocumentTemplate:
         Returns:
             Field with the given name, or None if not found
         """
-        for field in self.fields:
-            if field.name == name:
-                return field
-        
-        return None
+        return self._get_name_index().get(name)
     
     def get_field_mapping(self) -> Dict[str, FormField]:
         """Get a mapping of field names to field objects.
         
         Returns:
-            Dictionary mapping field names to field objects
+            Dictionary mapping field names to field objects (shared with the
+            template, so it should not be modified)
         """
-        return {field.name: field for field in self.fields}
+        return self._get_name_index()
     
     def visualize_fields(self, output_file: Optional[Union[str, Path]] = None) -> Path:
         """Create a visual representation of the fields on the template.
@@ -271,19 +375,34 @@ class DocumentTemplate:
         # Open the template PDF
         doc = fitz.open(self.template_file)
         
+        # Load each page used by a field once
+        pages = {field.page: None for field in self.fields}
+        for page_number in pages:
+            pages[page_number] = doc[page_number]
+        
+        # Calculate absolute coordinates for all fields at once
+        n_fields = len(self.fields)
+        xs = np.fromiter((field.x for field in self.fields), dtype=np.float64, count=n_fields)
+        ys = np.fromiter((field.y for field in self.fields), dtype=np.float64, count=n_fields)
+        widths = np.fromiter((field.width for field in self.fields), dtype=np.float64, count=n_fields)
+        heights = np.fromiter((field.height for field in self.fields), dtype=np.float64, count=n_fields)
+        page_widths = np.fromiter(
+            (pages[field.page].rect.width for field in self.fields), dtype=np.float64, count=n_fields
+        )
+        page_heights = np.fromiter(
+            (pages[field.page].rect.height for field in self.fields), dtype=np.float64, count=n_fields
+        )
+        
+        x0s = xs * page_widths
+        y0s = ys * page_heights
+        x1s = (xs + widths) * page_widths
+        y1s = (ys + heights) * page_heights
+        
         # Draw fields on each page
-        for field in self.fields:
-            page = doc[field.page]
-            
-            # Get page dimensions
-            page_width = page.rect.width
-            page_height = page.rect.height
-            
-            # Calculate absolute coordinates
-            x0 = field.x * page_width
-            y0 = field.y * page_height
-            x1 = (field.x + field.width) * page_width
-            y1 = (field.y + field.height) * page_height
+        for field, x0, y0, x1, y1 in zip(
+            self.fields, x0s.tolist(), y0s.tolist(), x1s.tolist(), y1s.tolist()
+        ):
+            page = pages[field.page]
             
             # Draw a rectangle around the field
             rect = fitz.Rect(x0, y0, x1, y1)
@@ -317,6 +436,9 @@ class TemplateFiller:
         """
         self.template = template
         self.field_mapping = field_mapping or {}
+        
+        # Font for overlaid text, shared by every page and fill
+        self._font = fitz.Font("helv")
     
     def fill_template(
         self,
@@ -339,12 +461,12 @@ class TemplateFiller:
         
         output_file = Path(output_file)
         
-        # Open the template PDF
-        doc = fitz.open(self.template.template_file)
+        # Open a copy of the template; the widget pages are held until saving
+        doc, is_form, widget_map, pages = self.template.open_and_index()
         
         # Fill the form fields if the PDF has form fields
-        if doc.is_form_pdf:
-            self._fill_pdf_forms(doc, data)
+        if is_form:
+            self._fill_pdf_forms(widget_map, data)
         else:
             # For non-form PDFs, overlay text directly
             self._overlay_text(doc, data)
@@ -357,43 +479,39 @@ class TemplateFiller:
         
         return output_file
     
-    def _fill_pdf_forms(self, doc: fitz.Document, data: Dict[str, Any]):
+    def _fill_pdf_forms(self, widget_map: Dict[str, fitz.Widget], data: Dict[str, Any]):
         """Fill form fields in a PDF.
         
         Args:
-            doc: PyMuPDF document
+            widget_map: Field name -> widget of the document being filled
             data: Data to fill the form with
         """
+        get_data_field = self.field_mapping.get
+        
         for field in self.template.fields:
             # Get the data field name (may be different from the template field name)
-            data_field = self.field_mapping.get(field.name, field.name)
+            data_field = get_data_field(field.name, field.name)
             
             # Get the value from the data
             value = self._get_nested_value(data, data_field)
             
             if value is not None:
-                # Convert value to string for text fields
-                if field.field_type in ["Text", "TextField"]:
-                    value = str(value)
-                
-                # Handle checkbox fields
-                elif field.field_type in ["CheckBox", "CheckButton"]:
-                    value = bool(value)
-                
-                # Handle choice fields
-                elif field.field_type in ["Choice", "ListBox", "ComboBox"]:
-                    # Make sure the value is in the options
-                    if str(value) not in field.options:
-                        logger.warning(f"Value '{value}' not in options for field '{field.name}'")
-                        continue
+                # Convert the value for the field type (text fields take
+                # strings, checkboxes booleans, choices one of their options)
+                converted = convert_field_value(field.field_type, value, field.options)
+                if converted is None:
+                    logger.warning(f"Value '{value}' not in options for field '{field.name}'")
+                    continue
+                value = converted
                 
                 # Update the field
+                widget = widget_map.get(field.name)
+                if widget is None:
+                    continue
+                
                 try:
-                    # Find the widget with this field name
-                    for widget in doc.widgets():
-                        if widget.field_name == field.name:
-                            widget.field_value = value
-                            break
+                    widget.field_value = value
+                    widget.update()
                 except Exception as e:
                     logger.error(f"Error setting value for field '{field.name}': {str(e)}")
     
@@ -404,19 +522,32 @@ class TemplateFiller:
             doc: PyMuPDF document
             data: Data to overlay
         """
+        get_data_field = self.field_mapping.get
+        
+        # Group the fields by page, so each page is loaded and measured once
+        fields_by_page = defaultdict(list)
         for field in self.template.fields:
-            # Get the data field name (may be different from the template field name)
-            data_field = self.field_mapping.get(field.name, field.name)
+            fields_by_page[field.page].append(field)
+        
+        for page_number, fields in fields_by_page.items():
+            page = doc[page_number]
             
-            # Get the value from the data
-            value = self._get_nested_value(data, data_field)
+            # Get page dimensions
+            page_width = page.rect.width
+            page_height = page.rect.height
             
-            if value is not None:
-                page = doc[field.page]
+            # Collect the page's text and write it in one operation
+            writer = fitz.TextWriter(page.rect)
+            
+            for field in fields:
+                # Get the data field name (may be different from the template field name)
+                data_field = get_data_field(field.name, field.name)
+                
+                # Get the value from the data
+                value = self._get_nested_value(data, data_field)
                 
-                # Get page dimensions
-                page_width = page.rect.width
-                page_height = page.rect.height
+                if value is None:
+                    continue
                 
                 # Calculate absolute coordinates
                 x = field.x * page_width
@@ -425,13 +556,19 @@ class TemplateFiller:
                 # Convert value to string
                 text = str(value)
                 
-                # Insert text at the field position
-                page.insert_text(
-                    fitz.Point(x, y),
-                    text,
-                    fontsize=10,
-                    color=(0, 0, 0)
-                )
+                # Insert text at the field position. TextWriter writes single
+                # lines, so multi-line values keep insert_text's line layout
+                if "\n" in text:
+                    page.insert_text(
+                        fitz.Point(x, y),
+                        text,
+                        fontsize=10,
+                        color=(0, 0, 0)
+                    )
+                else:
+                    writer.append(fitz.Point(x, y), text, font=self._font, fontsize=10)
+            
+            writer.write_text(page, color=(0, 0, 0))
     
     def _get_nested_value(self, data: Dict[str, Any], field_path: str) -> Any:
         """Get a value from nested dictionaries using a dot-separated path.
@@ -443,30 +580,30 @@ class TemplateFiller:
         Returns:
             Value at the specified path, or None if not found
         """
-        parts = field_path.split(".")
-        value = data
-        
-        for part in parts:
-            # Handle array indices in the path (e.g., education[0].university)
-            if "[" in part and "]" in part:
-                array_name, index_str = part.split("[", 1)
-                index = int(index_str.split("]")[0])
-                
-                if array_name in value:
-                    array_value = value[array_name]
-                    if isinstance(array_value, list) and 0 <= index < len(array_value):
-                        value = array_value[index]
-                    else:
-                        return None
-                else:
-                    return None
-            else:
-                if part in value:
-                    value = value[part]
-                else:
-                    return None
-        
-        return value
+        # The path is parsed once and cached; array indices in the path
+        # (e.g., education[0].university) become separate lookup steps
+        return get_nested_value(data, field_path)
+
+
+# Template filler of a batch worker process, set by init_fill_worker
+_worker_filler: Optional[TemplateFiller] = None
+
+
+def init_fill_worker(template_file: Path, fields: List[FormField]):
+    """Set up the template filler of a batch worker process.
+    
+    The parent's fields are passed in rather than reloaded from disk, so
+    fields it added or extracted without saving are kept.
+    """
+    global _worker_filler
+    template = DocumentTemplate(template_file)
+    template.fields = fields
+    _worker_filler = TemplateFiller(template)
+
+
+def fill_template_file(data: Dict[str, Any], output_file: Path) -> Path:
+    """Fill one form in a batch worker process."""
+    return _worker_filler.fill_template(data, output_file)
 
 
 class TemplateField:
@@ -499,8 +636,7 @@ class TemplateField:
     def _load_fields(self):
         """Load fields from the output JSON file."""
         try:
-            with open(self.output_file, "r", encoding="utf-8") as f:
-                fields_data = json.load(f)
+            fields_data = _read_fields_file(self.output_file)
             
             self.fields = [FormField.from_dict(field_data) for field_data in fields_data]
             logger.info(f"Loaded {len(self.fields)} fields from {self.output_file}")
@@ -546,8 +682,7 @@ class TemplateField:
         fields_data = [field.to_dict() for field in self.fields]
         
         # Save to file
-        with open(self.output_file, "w", encoding="utf-8") as f:
-            json.dump(fields_data, f, indent=2, ensure_ascii=False)
+        _write_fields_file(self.output_file, fields_data)
         
         logger.info(f"Saved {len(self.fields)} fields to {self.output_file}")
         
@@ -8,9 +8,19 @@ of the document automation module.
 
 import os
 import sys
+import random
 import logging
+import tempfile
 from pathlib import Path
 
+import fitz
+import numpy as np
+import torch
+import torch.nn.functional as F
+from rapidfuzz.distance import Levenshtein
+from nltk.translate.bleu_score import sentence_bleu
+from nltk.translate.meteor_score import meteor_score
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
@@ -31,6 +41,7 @@ from ml.document_automation import (
     FormFillingEvaluator,
     evaluate_model
 )
+from ml.document_automation.evaluation import PredictionMetrics
 
 # Configure logging
 logging.basicConfig(
@@ -193,13 +204,231 @@ def test_integration():
         logger.error(f"Error initializing interface: {str(e)}")
 
 
+def _baseline_prediction_metrics(predictions):
+    """Score predictions one at a time, as PredictionMetrics originally did."""
+    scores = []
+    for field_name, predicted_value, true_value in predictions:
+        predicted_value = " ".join(str(predicted_value).split()) if predicted_value is not None else ""
+        true_value = " ".join(str(true_value).split()) if true_value is not None else ""
+        
+        if true_value:
+            char_error = Levenshtein.distance(predicted_value, true_value) / len(true_value)
+        else:
+            char_error = 1.0 if predicted_value else 0.0
+        
+        reference = [true_value.split()]
+        candidate = predicted_value.split()
+        if candidate and true_value:
+            bleu = sentence_bleu(reference, candidate, weights=(0.25, 0.25, 0.25, 0.25))
+            meteor = meteor_score(reference, candidate)
+        else:
+            bleu = meteor = 1.0 if (not true_value and not predicted_value) else 0.0
+        
+        scores.append((field_name, float(predicted_value == true_value), char_error, bleu, meteor))
+    
+    def summarize(rows):
+        return {
+            "exact_match_accuracy": np.mean([row[1] for row in rows]),
+            "character_error_rate": np.mean([row[2] for row in rows]),
+            "bleu_score": np.mean([row[3] for row in rows]),
+            "meteor_score": np.mean([row[4] for row in rows]),
+        }
+    
+    by_field = {}
+    for row in scores:
+        by_field.setdefault(row[0], []).append(row)
+    
+    metrics = summarize(scores)
+    metrics["total_samples"] = len(scores)
+    metrics["field_specific_metrics"] = {
+        field_name: {**summarize(rows), "sample_count": len(rows)}
+        for field_name, rows in by_field.items()
+    }
+    return metrics
+
+
+def _assert_metrics_close(metrics, expected):
+    """Compare metrics dictionaries, allowing for floating point summation order."""
+    assert metrics.keys() == expected.keys(), (metrics.keys(), expected.keys())
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            _assert_metrics_close(metrics[key], value)
+        else:
+            assert np.isclose(metrics[key], value, rtol=1e-9, atol=1e-12), (key, metrics[key], value)
+
+
+def test_prediction_metrics():
+    """Test that prediction metrics match scoring each prediction on its own."""
+    logger.info("Testing prediction metrics...")
+    
+    rng = random.Random(0)
+    words = ["john", "smith", "new", "york", "software", "engineer", "acme", "inc", "the", "of"]
+    
+    def random_value():
+        kind = rng.random()
+        if kind < 0.1:
+            return None
+        if kind < 0.2:
+            return rng.choice(["", "  ", 42, "01/02/2023"])
+        return " ".join(rng.choice(words) for _ in range(rng.randint(1, 8)))
+    
+    predictions = []
+    for _ in range(600):
+        field_name = rng.choice(["name", "address", "employer", None])
+        true_value = random_value()
+        # Repeat some values exactly, including long ones that skip NLTK
+        predicted_value = true_value if rng.random() < 0.3 else random_value()
+        predictions.append((field_name, predicted_value, true_value))
+    
+    expected = _baseline_prediction_metrics(predictions)
+    
+    # Empty metrics keep their original defaults
+    assert PredictionMetrics().get_metrics()["field_specific_metrics"] == {}
+    
+    # Score in this process, in worker processes, and merged from parts
+    sequential = PredictionMetrics(max_workers=1)
+    parallel = PredictionMetrics(max_workers=2)
+    merged = PredictionMetrics(max_workers=1)
+    parts = [PredictionMetrics(max_workers=1) for _ in range(3)]
+    
+    for i, prediction in enumerate(predictions):
+        sequential.add_prediction(*prediction)
+        parallel.add_prediction(*prediction)
+        parts[i % len(parts)].add_prediction(*prediction)
+    
+    # Score one part before merging, so merged scores are reused
+    parts[0].get_metrics()
+    for part in parts:
+        merged += part
+    
+    _assert_metrics_close(sequential.get_metrics(), expected)
+    _assert_metrics_close(parallel.get_metrics(), expected)
+    _assert_metrics_close(merged.get_metrics(), expected)
+    
+    # Structured values score their exact match for BLEU and METEOR
+    structured = PredictionMetrics(max_workers=1)
+    structured.add_prediction("date", "01/02/2023", "01/02/2023", structured=True)
+    structured.add_prediction("date", "01/03/2023", "01/02/2023", structured=True)
+    structured_metrics = structured.get_metrics()
+    assert structured_metrics["bleu_score"] == structured_metrics["meteor_score"] == 0.5
+    
+    logger.info(f"Metrics for {len(predictions)} predictions match the baseline")
+
+
+def test_checkpoint_migration():
+    """Test loading a checkpoint saved with separate value and type projections."""
+    logger.info("Testing checkpoint migration...")
+    
+    config = dict(
+        vocab_size=100,
+        embedding_dim=32,
+        hidden_dim=64,
+        encoder_layers=1,
+        decoder_layers=1,
+        num_heads=2,
+        max_seq_length=32,
+        dropout=0.1
+    )
+    model = create_model(**config)
+    model.eval()
+    
+    # Split the fused projection into the layers older checkpoints stored
+    vocab_size = config["vocab_size"]
+    prefix = "field_value_predictor."
+    state_dict = model.state_dict()
+    for name in ("weight", "bias"):
+        fused = state_dict.pop(f"{prefix}fused_projection.{name}")
+        state_dict[f"{prefix}output_projection.{name}"] = fused[:vocab_size].clone()
+        state_dict[f"{prefix}field_type_classifier.{name}"] = fused[vocab_size:].clone()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        checkpoint_path = Path(tmp_dir) / "old_model.pt"
+        torch.save(state_dict, checkpoint_path)
+        
+        loaded = load_model(checkpoint_path, **config)
+        loaded.eval()
+        
+        # Every weight comes back, with the projections fused again
+        loaded_state_dict = loaded.state_dict()
+        assert loaded_state_dict.keys() == model.state_dict().keys()
+        for key, value in model.state_dict().items():
+            assert torch.equal(loaded_state_dict[key], value), key
+        
+        # The fused layer predicts what the separate layers did
+        x = torch.randn(2, 5, config["hidden_dim"])
+        with torch.no_grad():
+            value_logits, type_logits = loaded.field_value_predictor(x)
+        
+        expected_value_logits = F.linear(
+            x, state_dict[f"{prefix}output_projection.weight"], state_dict[f"{prefix}output_projection.bias"]
+        )
+        expected_type_logits = F.linear(
+            x, state_dict[f"{prefix}field_type_classifier.weight"], state_dict[f"{prefix}field_type_classifier.bias"]
+        )
+        assert torch.allclose(value_logits, expected_value_logits, atol=1e-6)
+        assert torch.allclose(type_logits, expected_type_logits, atol=1e-6)
+    
+    logger.info("Old checkpoint loaded into the fused projection")
+
+
+def test_fill_multi_page_form():
+    """Test filling a form with fields on several pages."""
+    logger.info("Testing multi-page form filling...")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        template_path = Path(tmp_dir) / "form.pdf"
+        
+        # Build a three-page form with fields on the first and last pages
+        page_widgets = {
+            0: [("name", fitz.PDF_WIDGET_TYPE_TEXT)],
+            2: [("city", fitz.PDF_WIDGET_TYPE_TEXT), ("agree", fitz.PDF_WIDGET_TYPE_CHECKBOX)]
+        }
+        doc = fitz.open()
+        for page_number in range(3):
+            page = doc.new_page()
+            for i, (field_name, field_type) in enumerate(page_widgets.get(page_number, [])):
+                widget = fitz.Widget()
+                widget.field_name = field_name
+                widget.field_type = field_type
+                widget.rect = fitz.Rect(72, 72 + 40 * i, 272, 92 + 40 * i)
+                page.add_widget(widget)
+        doc.save(template_path)
+        doc.close()
+        
+        template = DocumentTemplate(template_path)
+        assert {(field.name, field.page) for field in template.fields} == {("name", 0), ("city", 2), ("agree", 2)}
+        
+        filler = TemplateFiller(template, field_mapping={"city": "address.city"})
+        data = {"name": "Jane Doe", "address": {"city": "Boston"}, "agree": True}
+        
+        # Fill twice, since later fills reuse the template's cached layout
+        for i in range(2):
+            output_path = filler.fill_template(data, Path(tmp_dir) / f"filled_{i}.pdf")
+            
+            with fitz.open(output_path) as filled:
+                values = {
+                    widget.field_name: widget.field_value
+                    for page in filled
+                    for widget in page.widgets()
+                }
+            
+            assert values["name"] == "Jane Doe", values
+            assert values["city"] == "Boston", values
+            assert values["agree"] not in (False, "Off", ""), values
+    
+    logger.info("Filled fields on every page of the form")
+
+
 def run_all_tests():
     """Run all tests."""
     tests = [
         test_data_loader,
         test_model_architecture,
         test_tokenizer,
-        test_integration
+        test_integration,
+        test_prediction_metrics,
+        test_checkpoint_migration,
+        test_fill_multi_page_form
     ]
     
     for test in tests:
@@ -223,6 +452,12 @@ if __name__ == "__main__":
             test_tokenizer()
         elif test_name == "integration":
             test_integration()
+        elif test_name == "metrics":
+            test_prediction_metrics()
+        elif test_name == "checkpoint":
+            test_checkpoint_migration()
+        elif test_name == "fill":
+            test_fill_multi_page_form()
         else:
             logger.error(f"Unknown test: {test_name}")
     else:
@@ -1,8 +1,25 @@
+import os
+
 from setuptools import setup, find_packages
 
+# Optionally compile the regex-heavy extraction module, the synthetic data
+# field walk and the template field fill with mypyc. mypy must already be
+# installed, since the build uses it from the current environment:
+#   PROMETHEUS_MYPYC=1 pip install --no-build-isolation -e .
+# Falls back to pure Python.
+ext_modules = []
+if os.environ.get("PROMETHEUS_MYPYC") == "1":
+    from mypyc.build import mypycify
+    ext_modules = mypycify([
+        "ml/data_extraction.py",
+        "ml/document_automation/field_walk.py",
+        "ml/document_automation/field_fill.py",
+    ])
+
 setup(
     name="prometheus-api",
     version="0.1.0",
     packages=find_packages(),
     include_package_data=True,
-) 
\ No newline at end of file
+    ext_modules=ext_modules,
+)